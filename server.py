@@ -1,14 +1,25 @@
 import os
 import json
+import asyncio
+import functools
 import sqlite3
 import logging
+import multiprocessing
+import queue
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from io import BytesIO
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from decimal import Decimal
+from itertools import chain, islice
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator, Union
 from functools import lru_cache
 import time
 
 import anyio
+import orjson
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -19,27 +30,37 @@ from dotenv import load_dotenv
 # Simple In-Memory Cache
 # =========================
 class SimpleCache:
-    """Simple TTL-based in-memory cache for API responses."""
+    """Simple TTL-based in-memory cache for API responses.
 
-    def __init__(self):
-        self._cache: Dict[str, Tuple[Any, float]] = {}
+    With max_entries set, the least recently used key is evicted on overflow.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._cache: Dict[Any, Tuple[Any, float]] = {}
         self._default_ttl = 300  # 5 minutes default
+        self._max_entries = max_entries
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Any) -> Optional[Any]:
         """Get value from cache if not expired."""
         if key in self._cache:
             value, expires_at = self._cache[key]
             if time.time() < expires_at:
+                if self._max_entries:
+                    # Re-insert so dict order tracks recency
+                    self._cache[key] = self._cache.pop(key)
                 return value
             del self._cache[key]
         return None
 
-    def set(self, key: str, value: Any, ttl: int = None) -> None:
+    def set(self, key: Any, value: Any, ttl: int = None) -> None:
         """Set value in cache with TTL."""
         ttl = ttl or self._default_ttl
+        self._cache.pop(key, None)
         self._cache[key] = (value, time.time() + ttl)
+        if self._max_entries and len(self._cache) > self._max_entries:
+            del self._cache[next(iter(self._cache))]
 
-    def delete(self, key: str) -> None:
+    def delete(self, key: Any) -> None:
         """Remove key from cache."""
         self._cache.pop(key, None)
 
@@ -57,6 +78,48 @@ class SimpleCache:
 # Global cache instance
 api_cache = SimpleCache()
 
+# Table name -> caches holding rows derived from it; execute_write clears
+# them when a statement mentions the table.
+_CACHES_BY_TABLE: Dict[str, List[SimpleCache]] = {}
+
+
+def async_ttl_cache(ttl: int, maxsize: int = 4096, tables: Tuple[str, ...] = ()):
+    """Cache an async function's result per argument tuple for `ttl` seconds.
+
+    The cached value is the task itself, so concurrent callers with the same
+    arguments share one in-flight call. Failed calls are not cached.
+    `tables` registers the cache for invalidation on writes to those tables.
+    """
+    def decorator(fn):
+        cache = SimpleCache(max_entries=maxsize)
+        for table in tables:
+            _CACHES_BY_TABLE.setdefault(table, []).append(cache)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                task = cache.get(key)
+            except TypeError:  # unhashable arguments: don't cache
+                return await fn(*args, **kwargs)
+            if task is None:
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                cache.set(key, task, ttl)
+
+                def _drop_failed(t, key=key):
+                    if t.cancelled() or t.exception() is not None:
+                        cache.delete(key)
+
+                task.add_done_callback(_drop_failed)
+            # shield: a cancelled caller must not cancel the shared task
+            return await asyncio.shield(task)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
 # Load .env from the project directory (same folder as this file),
 # so it works even if you start uvicorn from a different working directory.
 BASE_DIR = os.path.dirname(__file__)
@@ -64,11 +127,11 @@ ENV_PATH = os.path.join(BASE_DIR, ".env")
 load_dotenv(dotenv_path=ENV_PATH, override=True)
 
 from fastapi import FastAPI, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 # Optional PDF generation (install: pip install reportlab)
 try:
@@ -99,10 +162,22 @@ if DATABASE_URL.startswith("postgres://"):
 OPENAI_API_KEY = (os.environ.get("OPENAI_API_KEY") or "").strip()
 OPENAI_MODEL = (os.environ.get("OPENAI_MODEL") or "o3").strip()
 
-oa = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# One async client per process so HTTP connections are pooled across requests
+# and LLM calls never block the event loop.
+oa = AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
+# Identical prompts within this window (retries, page refreshes) reuse the
+# previous completion instead of another OpenAI round trip.
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", "600"))
+llm_cache = SimpleCache(max_entries=512)
+# Replies are also kept in the llm_cache table so they survive restarts
+LLM_STORE_TTL = int(os.environ.get("LLM_STORE_TTL", "86400"))
 
-app = FastAPI(title="Client Storytelling Prototype (DB-only)")
+
+app = FastAPI(
+    title="Client Storytelling Prototype (DB-only)",
+    default_response_class=ORJSONResponse,
+)
 
 FRONTEND_DIR = os.path.join(BASE_DIR, "frontend")
 if os.path.isdir(FRONTEND_DIR):
@@ -112,21 +187,59 @@ if os.path.isdir(FRONTEND_DIR):
 @app.on_event("startup")
 async def startup_event():
     """Initialize database tables and views on startup."""
+    start_pdf_executor()
     await ensure_audit_table()
+    await ensure_llm_cache_table()
+    await start_audit_writer()
     await ensure_analytics_views()
+    await ensure_client_search_index()
+    await ensure_stock_search_index()
+    await load_stock_cache()
+    load_index_html()
+    global _optimize_task
+    _optimize_task = asyncio.create_task(_periodic_optimize())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background maintenance tasks and flush the audit queue."""
+    if _optimize_task is not None:
+        _optimize_task.cancel()
+    await stop_audit_writer()
+    stop_pdf_executor()
+    if DB_TYPE == "postgres":
+        close_pg_pool()
 
 
 # =========================
 # Root endpoint - serve frontend
 # =========================
 
+# index.html is read once at startup and served from memory with an ETag
+_INDEX_HTML: Optional[bytes] = None
+_INDEX_ETAG: Optional[str] = None
+
+
+def load_index_html() -> None:
+    global _INDEX_HTML, _INDEX_ETAG
+    index_path = os.path.join(FRONTEND_DIR, "index.html")
+    if not os.path.isfile(index_path):
+        _INDEX_HTML = _INDEX_ETAG = None
+        return
+    with open(index_path, "rb") as f:
+        _INDEX_HTML = f.read()
+    _INDEX_ETAG = '"' + hashlib.md5(_INDEX_HTML).hexdigest() + '"'
+
+
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the main frontend."""
-    index_path = os.path.join(FRONTEND_DIR, "index.html")
-    if os.path.isfile(index_path):
-        return FileResponse(index_path)
-    return HTMLResponse("<h1>Frontend not found</h1><p>Place index.html in frontend/</p>")
+    if _INDEX_HTML is None:
+        return HTMLResponse("<h1>Frontend not found</h1><p>Place index.html in frontend/</p>")
+    if_none_match = request.headers.get("if-none-match", "")
+    if _INDEX_ETAG in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": _INDEX_ETAG})
+    return Response(content=_INDEX_HTML, media_type="text/html", headers={"ETag": _INDEX_ETAG})
 
 
 @app.get("/login", response_class=HTMLResponse)
@@ -257,12 +370,16 @@ async def get_service_worker():
 # DB helpers (SQLite + PostgreSQL)
 # =========================
 
+# SQL text is nearly always a module constant, so the regex rewrites below
+# are memoized per statement.
+@lru_cache(maxsize=1024)
 def _convert_params_to_pg(sql: str) -> str:
     """Convert SQLite :param syntax to PostgreSQL %(param)s syntax."""
     import re
     return re.sub(r":(\w+)", r"%(\1)s", sql)
 
 
+@lru_cache(maxsize=1024)
 def _convert_date_functions(sql: str) -> str:
     """Convert SQLite date functions to PostgreSQL equivalents."""
     import re
@@ -276,53 +393,180 @@ def _convert_date_functions(sql: str) -> str:
     return sql
 
 
+# SQLite connection tuning, applied once per connection.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-131072",    # 128 MiB page cache
+    "PRAGMA mmap_size=268435456",   # 256 MiB memory-mapped I/O
+    "PRAGMA foreign_keys=ON",
+)
+
+# Number of pooled read connections (writes share a single connection)
+SQLITE_READ_POOL_SIZE = max(1, int(os.environ.get("SQLITE_READ_POOL_SIZE", "4")))
+
+# Prepared statements kept per connection, keyed by SQL text (sqlite3's
+# default is 128, fewer than the distinct queries this app issues)
+SQLITE_STATEMENT_CACHE = 512
+
+
+def _connect_once(read_only: bool = False) -> sqlite3.Connection:
+    """Open a tuned SQLite connection that can be handed between worker threads."""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=SQLITE_STATEMENT_CACHE)
+    conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    if read_only:
+        # Pooled readers never write; lets SQLite skip write-txn bookkeeping
+        conn.execute("PRAGMA query_only=1")
+    return conn
+
+
+class _SQLiteReadPool:
+    """Fixed-size pool of read connections, created lazily and reused.
+
+    Blocking DB calls run in anyio worker threads, so this uses a thread-safe
+    queue.Queue rather than an asyncio.Queue.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self._size
+            if can_create:
+                self._created += 1
+        if not can_create:
+            return self._idle.get()
+        try:
+            return _connect_once(read_only=True)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+
+_sqlite_read_pool = _SQLiteReadPool(SQLITE_READ_POOL_SIZE)
+
+# Single shared write connection; SQLite allows one writer at a time anyway.
+_sqlite_write_conn: Optional[sqlite3.Connection] = None
+_sqlite_write_lock = threading.Lock()
+
+
+def _get_write_connection() -> sqlite3.Connection:
+    """Return the shared write connection. Caller must hold _sqlite_write_lock."""
+    global _sqlite_write_conn
+    if _sqlite_write_conn is None:
+        _sqlite_write_conn = _connect_once()
+    return _sqlite_write_conn
+
+
+# PostgreSQL connections are pooled per process instead of opened per query
+PG_POOL_MIN = max(1, int(os.environ.get("PG_POOL_MIN", "2")))
+PG_POOL_MAX = max(PG_POOL_MIN, int(os.environ.get("PG_POOL_MAX", "20")))
+# Rows per round trip for execute_many on PostgreSQL
+PG_BATCH_PAGE_SIZE = 100
+
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises when exhausted; the semaphore makes callers wait
+_pg_pool_slots = threading.BoundedSemaphore(PG_POOL_MAX)
+
+
+def _get_pg_pool():
+    """Return the process-wide PostgreSQL pool, creating it on first use."""
+    global _pg_pool
+    if _pg_pool is None:
+        with _pg_pool_lock:
+            if _pg_pool is None:
+                from psycopg2.extras import RealDictCursor
+                from psycopg2.pool import ThreadedConnectionPool
+                _pg_pool = ThreadedConnectionPool(
+                    PG_POOL_MIN, PG_POOL_MAX, DATABASE_URL, cursor_factory=RealDictCursor
+                )
+    return _pg_pool
+
+
+@contextmanager
 def _get_connection():
-    """Get a database connection based on DB_TYPE."""
-    if DB_TYPE == "postgres":
-        import psycopg2
-        from psycopg2.extras import RealDictCursor
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    else:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+    """Borrow a PostgreSQL connection from the pool (SQLite uses its own pool)."""
+    import psycopg2
+    pool = _get_pg_pool()
+    with _pg_pool_slots:
+        conn = pool.getconn()
+        if conn.closed:
+            # Server dropped it while idle; replace it before use
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            if not broken and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+def close_pg_pool() -> None:
+    """Close every pooled PostgreSQL connection (called on shutdown)."""
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is not None:
+            _pg_pool.closeall()
+            _pg_pool = None
 
 
 def _query_one(sql: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     params = params or {}
-    conn = _get_connection()
-    try:
-        if DB_TYPE == "postgres":
+    if DB_TYPE == "postgres":
+        with _get_connection() as conn:
             cur = conn.cursor()
             pg_sql = _convert_date_functions(_convert_params_to_pg(sql))
             cur.execute(pg_sql, params)
             row = cur.fetchone()
             return dict(row) if row else None
-        else:
-            cur = conn.execute(sql, params)
-            row = cur.fetchone()
-            return dict(row) if row else None
-    finally:
-        conn.close()
+    with _sqlite_read_pool.connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
 
 
 def _query_all(sql: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     params = params or {}
-    conn = _get_connection()
-    try:
-        if DB_TYPE == "postgres":
+    if DB_TYPE == "postgres":
+        with _get_connection() as conn:
             cur = conn.cursor()
             pg_sql = _convert_date_functions(_convert_params_to_pg(sql))
             cur.execute(pg_sql, params)
             rows = cur.fetchall()
             return [dict(r) for r in rows]
-        else:
-            cur = conn.execute(sql, params)
-            rows = cur.fetchall()
-            return [dict(r) for r in rows]
-    finally:
-        conn.close()
+    with _sqlite_read_pool.connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
 
 
 async def fetch_one(sql: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
@@ -335,26 +579,30 @@ async def fetch_all(sql: str, params: Optional[Dict[str, Any]] = None) -> List[D
     return await anyio.to_thread.run_sync(_query_all, sql, params)
 
 
-async def table_exists(table_name: str) -> bool:
+async def tables_exist(names: Iterable[str]) -> set:
+    """Return the subset of `names` that exist as tables or views (one query)."""
+    placeholders, params = _inlist("t", names)
+    if not params:
+        return set()
     if DB_TYPE == "postgres":
-        row = await fetch_one(
-            "SELECT tablename FROM pg_tables WHERE schemaname='public' AND tablename=:t",
-            {"t": table_name},
+        rows = await fetch_all(
+            "SELECT table_name AS name FROM information_schema.tables "
+            f"WHERE table_schema='public' AND table_name IN ({placeholders})",
+            params,
         )
     else:
-        row = await fetch_one(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=:t",
-            {"t": table_name},
+        rows = await fetch_all(
+            f"SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name IN ({placeholders})",
+            params,
         )
-    return bool(row)
+    return {r["name"] for r in rows}
 
 
 def _execute_write(sql: str, params: Optional[Dict[str, Any]] = None) -> int:
-    """Execute an INSERT/UPDATE/DELETE and return lastrowid."""
+    """Execute an INSERT/UPDATE/DELETE and return lastrowid (or the RETURNING value)."""
     params = params or {}
-    conn = _get_connection()
-    try:
-        if DB_TYPE == "postgres":
+    if DB_TYPE == "postgres":
+        with _get_connection() as conn:
             cur = conn.cursor()
             # Add RETURNING id for PostgreSQL to get the inserted ID
             pg_sql = _convert_params_to_pg(sql)
@@ -364,18 +612,144 @@ def _execute_write(sql: str, params: Optional[Dict[str, Any]] = None) -> int:
             conn.commit()
             if "INSERT" in sql.upper():
                 result = cur.fetchone()
-                return result["id"] if result else 0
+                return next(iter(result.values())) if result else 0
             return cur.rowcount
-        else:
+    with _sqlite_write_lock:
+        conn = _get_write_connection()
+        try:
             cur = conn.execute(sql, params)
+            if "RETURNING" in sql.upper():
+                # RETURNING rows must be read before the statement is finalized
+                row = cur.fetchone()
+                conn.commit()
+                return row[0] if row else 0
             conn.commit()
             return cur.lastrowid
-    finally:
-        conn.close()
+        except Exception:
+            conn.rollback()
+            raise
 
 
 async def execute_write(sql: str, params: Optional[Dict[str, Any]] = None) -> int:
-    return await anyio.to_thread.run_sync(_execute_write, sql, params)
+    result = await anyio.to_thread.run_sync(_execute_write, sql, params)
+    _invalidate_caches_for(sql)
+    return result
+
+
+def _execute_many(sql: str, rows: List[Dict[str, Any]]) -> None:
+    """Run one parameterized statement for every row in a single transaction."""
+    if DB_TYPE == "postgres":
+        from psycopg2.extras import execute_batch
+        with _get_connection() as conn:
+            cur = conn.cursor()
+            # psycopg2's executemany is one round trip per row; execute_batch
+            # sends the rows in pages
+            execute_batch(cur, _convert_params_to_pg(sql), rows, page_size=PG_BATCH_PAGE_SIZE)
+            conn.commit()
+        return
+    with _sqlite_write_lock:
+        conn = _get_write_connection()
+        try:
+            conn.executemany(sql, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+async def execute_many(sql: str, rows: List[Dict[str, Any]]) -> None:
+    await anyio.to_thread.run_sync(_execute_many, sql, rows)
+    _invalidate_caches_for(sql)
+
+
+def _execute_insert_many(sql: str, rows: List[Dict[str, Any]]) -> List[int]:
+    """SQLite: insert every row in a single transaction and return their rowids."""
+    with _sqlite_write_lock:
+        conn = _get_write_connection()
+        try:
+            ids = [conn.execute(sql, row).lastrowid for row in rows]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return ids
+
+
+async def execute_insert_many(sql: str, rows: List[Dict[str, Any]]) -> List[int]:
+    result = await anyio.to_thread.run_sync(_execute_insert_many, sql, rows)
+    _invalidate_caches_for(sql)
+    return result
+
+
+def _execute_write_batch(statements: List[str]) -> None:
+    """Run a list of DDL/DML statements in one transaction (one commit/fsync)."""
+    if DB_TYPE == "postgres":
+        with _get_connection() as conn:
+            cur = conn.cursor()
+            for sql in statements:
+                cur.execute(_convert_params_to_pg(sql))
+            conn.commit()
+        return
+    with _sqlite_write_lock:
+        conn = _get_write_connection()
+        # Bulk load: skip fsyncs until the single commit, then restore NORMAL
+        conn.execute("PRAGMA synchronous=OFF")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql in statements:
+                conn.execute(sql)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+
+async def execute_write_batch(statements: List[str]) -> None:
+    await anyio.to_thread.run_sync(_execute_write_batch, statements)
+    for sql in statements:
+        _invalidate_caches_for(sql)
+
+
+# =========================
+# Stock reference cache (src_stocks is small and effectively static)
+# =========================
+
+STOCK_CACHE_TTL = 3600  # seconds; writes touching src_stocks reset it immediately
+
+_STOCK_CACHE: Dict[int, Dict[str, Any]] = {}
+_stock_cache_loaded_at = 0.0
+
+
+async def load_stock_cache() -> Dict[int, Dict[str, Any]]:
+    """(Re)load stock_id -> ticker/company_name/sector/theme_tag from src_stocks."""
+    global _STOCK_CACHE, _stock_cache_loaded_at
+    rows = await fetch_all(
+        "SELECT stock_id, ticker, company_name, sector, theme_tag FROM src_stocks"
+    )
+    _STOCK_CACHE = {int(r["stock_id"]): r for r in rows}
+    _stock_cache_loaded_at = time.time()
+    return _STOCK_CACHE
+
+
+async def get_stock_cache() -> Dict[int, Dict[str, Any]]:
+    """Return the stock reference cache, reloading it when stale."""
+    if time.time() - _stock_cache_loaded_at > STOCK_CACHE_TTL:
+        return await load_stock_cache()
+    return _STOCK_CACHE
+
+
+def _invalidate_caches_for(sql: str) -> None:
+    """Drop in-process caches that depend on tables touched by a write."""
+    global _stock_cache_loaded_at
+    sql_lower = sql.lower()
+    if "src_stocks" in sql_lower:
+        _stock_cache_loaded_at = 0.0
+    for table, caches in _CACHES_BY_TABLE.items():
+        if table in sql_lower:
+            for cache in caches:
+                cache.clear()
 
 
 # =========================
@@ -406,16 +780,25 @@ async def ensure_audit_table():
     """)
 
 
-async def _insert_sample_enhanced_data():
-    """Insert sample data for enhanced tables if empty."""
 
-    # Check if client preferences already has data
-    existing = await fetch_one("SELECT COUNT(*) as cnt FROM src_client_preferences")
-    if existing and existing.get("cnt", 0) > 0:
-        return  # Already has data
+async def ensure_llm_cache_table():
+    """Create the llm_cache table (persistent LLM replies) if it doesn't exist."""
+    await execute_write("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            prompt_sha256 TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response_text TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+
+
+def _sample_enhanced_data_statements() -> List[str]:
+    """Sample data inserts for the enhanced tables (recreated empty on startup)."""
+    statements: List[str] = []
 
     # Sample Client Preferences
-    await execute_write("""
+    statements.append("""
         INSERT OR IGNORE INTO src_client_preferences
         (client_id, prefers_dividends, prefers_growth, prefers_esg, preferred_sectors, preferred_themes, min_dividend_yield, max_volatility, preference_notes)
         VALUES
@@ -427,7 +810,7 @@ async def _insert_sample_enhanced_data():
     """)
 
     # Sample Stock Fundamentals
-    await execute_write("""
+    statements.append("""
         INSERT OR IGNORE INTO src_stock_fundamentals
         (stock_id, as_of_date, pe_ratio, pe_forward, dividend_yield, roe, profit_margin, revenue_growth_yoy, beta, market_cap, market_cap_bucket, quality_score)
         VALUES
@@ -439,7 +822,7 @@ async def _insert_sample_enhanced_data():
     """)
 
     # Sample Analyst Ratings
-    await execute_write("""
+    statements.append("""
         INSERT OR IGNORE INTO src_analyst_ratings
         (stock_id, analyst_name, rating, rating_date, price_target, current_price, upside_percent, conviction_level, thesis_summary, key_catalysts)
         VALUES
@@ -451,7 +834,7 @@ async def _insert_sample_enhanced_data():
     """)
 
     # Sample Catalysts
-    await execute_write("""
+    statements.append("""
         INSERT OR IGNORE INTO src_stock_catalysts
         (stock_id, event_type, event_date, event_time, event_title, expected_impact, sentiment, eps_estimate)
         VALUES
@@ -463,7 +846,7 @@ async def _insert_sample_enhanced_data():
     """)
 
     # Sample Sector Overview
-    await execute_write("""
+    statements.append("""
         INSERT OR IGNORE INTO src_sector_overview
         (sector_name, sector_rating, sector_analyst, rating_date, key_themes, key_risks, avg_pe, avg_dividend_yield, top_picks)
         VALUES
@@ -475,9 +858,88 @@ async def _insert_sample_enhanced_data():
         ('Utilities', 'Neutral', 'Erik Svensson', '2026-01-01', 'Renewables growth', 'Rate sensitivity', 15.5, 0.048, 'ENEL,IBE')
     """)
 
+    return statements
+
+
+# (index name, table, columns) - client_id-keyed lookups used by the
+# per-client getters and analytics views
+CLIENT_LOOKUP_INDEXES = [
+    ("ix_call_logs_client_ts", "src_call_logs", "client_id, call_timestamp DESC"),
+    ("ix_trades_client_ts", "src_trade_executions", "client_id, trade_timestamp DESC"),
+    ("ix_snapshots_client_date", "src_portfolio_snapshots", "client_id, as_of_date DESC"),
+    ("ix_positions_snapshot", "src_positions", "snapshot_id"),
+    ("ix_readership_client", "src_readership_events", "client_id"),
+    ("ix_meetings_client", "src_client_meetings", "client_id"),
+    ("ix_email_activity_client", "src_client_email_activity", "client_id"),
+    ("ix_client_events_client", "src_client_events", "client_id"),
+]
+
+
+# mv_client_trade_agg: (counter column, predicate on a src_trade_executions row)
+MV_TRADE_AGG_COUNTERS = [
+    ("ai_trades", "theme_tag = 'AI'"),
+    ("energy_trades", "theme_tag = 'EnergyTransition'"),
+    ("esg_trades", "theme_tag = 'ESG'"),
+    ("tech_trades", "sector = 'Tech'"),
+    ("healthcare_trades", "sector = 'Healthcare'"),
+    ("financials_trades", "sector = 'Financials'"),
+]
+
+
+def _mv_client_trade_agg_statements() -> List[str]:
+    """DDL, seed and maintenance triggers for mv_client_trade_agg."""
+    counters = [name for name, _ in MV_TRADE_AGG_COUNTERS] + ["total_trades"]
+    cols = ", ".join(counters)
+
+    def deltas(row: str) -> List[str]:
+        # 1/0 per counter for a single trade row (total_trades always 1)
+        return [f"CASE WHEN {row}.{pred} THEN 1 ELSE 0 END" for _, pred in MV_TRADE_AGG_COUNTERS] + ["1"]
+
+    add_new = f"""
+        INSERT INTO mv_client_trade_agg (client_id, {cols})
+        VALUES (NEW.client_id, {", ".join(deltas("NEW"))})
+        ON CONFLICT(client_id) DO UPDATE SET
+            {", ".join(f"{c} = {c} + excluded.{c}" for c in counters)};
+    """
+    remove_old = f"""
+        UPDATE mv_client_trade_agg SET
+            {", ".join(f"{c} = {c} - ({d})" for c, d in zip(counters, deltas("OLD")))}
+        WHERE client_id = OLD.client_id;
+        DELETE FROM mv_client_trade_agg WHERE client_id = OLD.client_id AND total_trades <= 0;
+    """
+    sums = ", ".join(f"SUM(CASE WHEN {pred} THEN 1 ELSE 0 END)" for _, pred in MV_TRADE_AGG_COUNTERS)
+    return [
+        "DROP TRIGGER IF EXISTS mv_client_trade_agg_ai",
+        "DROP TRIGGER IF EXISTS mv_client_trade_agg_ad",
+        "DROP TRIGGER IF EXISTS mv_client_trade_agg_au",
+        "DROP TABLE IF EXISTS mv_client_trade_agg",
+        f"""
+        CREATE TABLE mv_client_trade_agg (
+            client_id INTEGER PRIMARY KEY,
+            {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in counters)}
+        )
+        """,
+        f"""
+        INSERT INTO mv_client_trade_agg (client_id, {cols})
+        SELECT client_id, {sums}, COUNT(*)
+        FROM src_trade_executions
+        GROUP BY client_id
+        """,
+        f"CREATE TRIGGER mv_client_trade_agg_ai AFTER INSERT ON src_trade_executions BEGIN {add_new} END",
+        f"CREATE TRIGGER mv_client_trade_agg_ad AFTER DELETE ON src_trade_executions BEGIN {remove_old} END",
+        f"CREATE TRIGGER mv_client_trade_agg_au AFTER UPDATE ON src_trade_executions BEGIN {remove_old} {add_new} END",
+    ]
+
+
+MV_CLIENT_TRADE_AGG_STATEMENTS = _mv_client_trade_agg_statements()
+
 
 async def ensure_analytics_views():
-    """Create enhanced analytics views and tables for SQLite."""
+    """Create enhanced analytics views and tables for SQLite.
+
+    All DDL and sample inserts are collected and applied in one transaction.
+    """
+    statements: List[str] = []
 
     # ===========================================
     # NEW TABLES FOR COMPREHENSIVE DATA
@@ -485,15 +947,15 @@ async def ensure_analytics_views():
 
     # Drop and recreate enhanced tables to ensure correct schema
     # These contain sample data only, safe to recreate
-    await execute_write("DROP TABLE IF EXISTS src_client_preferences")
-    await execute_write("DROP TABLE IF EXISTS src_stock_fundamentals")
-    await execute_write("DROP TABLE IF EXISTS src_analyst_ratings")
-    await execute_write("DROP TABLE IF EXISTS src_stock_catalysts")
-    await execute_write("DROP TABLE IF EXISTS src_sector_overview")
-    await execute_write("DROP TABLE IF EXISTS src_client_stock_history")
+    statements.append("DROP TABLE IF EXISTS src_client_preferences")
+    statements.append("DROP TABLE IF EXISTS src_stock_fundamentals")
+    statements.append("DROP TABLE IF EXISTS src_analyst_ratings")
+    statements.append("DROP TABLE IF EXISTS src_stock_catalysts")
+    statements.append("DROP TABLE IF EXISTS src_sector_overview")
+    statements.append("DROP TABLE IF EXISTS src_client_stock_history")
 
     # Client Preferences (real preferences, not inferred)
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_client_preferences (
             preference_id       INTEGER PRIMARY KEY AUTOINCREMENT,
             client_id           INTEGER NOT NULL,
@@ -516,7 +978,7 @@ async def ensure_analytics_views():
     """)
 
     # Stock Fundamentals
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_stock_fundamentals (
             fundamental_id      INTEGER PRIMARY KEY AUTOINCREMENT,
             stock_id            INTEGER NOT NULL,
@@ -542,7 +1004,7 @@ async def ensure_analytics_views():
     """)
 
     # Analyst Ratings
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_analyst_ratings (
             rating_id           INTEGER PRIMARY KEY AUTOINCREMENT,
             stock_id            INTEGER NOT NULL,
@@ -563,7 +1025,7 @@ async def ensure_analytics_views():
     """)
 
     # Upcoming Catalysts
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_stock_catalysts (
             catalyst_id         INTEGER PRIMARY KEY AUTOINCREMENT,
             stock_id            INTEGER NOT NULL,
@@ -582,7 +1044,7 @@ async def ensure_analytics_views():
     """)
 
     # Sector Overview
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_sector_overview (
             sector_id           INTEGER PRIMARY KEY AUTOINCREMENT,
             sector_name         TEXT NOT NULL UNIQUE,
@@ -599,7 +1061,7 @@ async def ensure_analytics_views():
     """)
 
     # Client-Stock History
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_client_stock_history (
             history_id          INTEGER PRIMARY KEY AUTOINCREMENT,
             client_id           INTEGER NOT NULL,
@@ -616,27 +1078,27 @@ async def ensure_analytics_views():
         )
     """)
 
-    # Insert sample data if tables are empty
-    await _insert_sample_enhanced_data()
+    # Sample data for the freshly recreated tables
+    statements.extend(_sample_enhanced_data_statements())
 
     # ===========================================
     # ANALYTICS VIEWS
     # ===========================================
 
     # Drop all analytics views to ensure schema updates are applied
-    await execute_write("DROP VIEW IF EXISTS ana_readership_daysdiff")
-    await execute_write("DROP VIEW IF EXISTS int_client_profile")
-    await execute_write("DROP VIEW IF EXISTS ana_client_portfolio_risk")
-    await execute_write("DROP VIEW IF EXISTS ana_client_engagement_momentum")
-    await execute_write("DROP VIEW IF EXISTS ana_client_conviction")
-    await execute_write("DROP VIEW IF EXISTS ana_client_readership_intelligence")
-    await execute_write("DROP VIEW IF EXISTS ana_bayesian_lead_score")
-    await execute_write("DROP VIEW IF EXISTS int_client_risk_enhanced")
-    await execute_write("DROP VIEW IF EXISTS int_client_risk_multifactor")
-    await execute_write("DROP VIEW IF EXISTS int_client_investment_style")
+    statements.append("DROP VIEW IF EXISTS ana_readership_daysdiff")
+    statements.append("DROP VIEW IF EXISTS int_client_profile")
+    statements.append("DROP VIEW IF EXISTS ana_client_portfolio_risk")
+    statements.append("DROP VIEW IF EXISTS ana_client_engagement_momentum")
+    statements.append("DROP VIEW IF EXISTS ana_client_conviction")
+    statements.append("DROP VIEW IF EXISTS ana_client_readership_intelligence")
+    statements.append("DROP VIEW IF EXISTS ana_bayesian_lead_score")
+    statements.append("DROP VIEW IF EXISTS int_client_risk_enhanced")
+    statements.append("DROP VIEW IF EXISTS int_client_risk_multifactor")
+    statements.append("DROP VIEW IF EXISTS int_client_investment_style")
 
     # 0a. Base view: Readership with days_diff
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS ana_readership_daysdiff AS
         SELECT
             e.event_id,
@@ -656,7 +1118,7 @@ async def ensure_analytics_views():
     """)
 
     # 0b. Base view: Client Profile
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS int_client_profile AS
         SELECT
             c.client_id,
@@ -697,7 +1159,7 @@ async def ensure_analytics_views():
     # 1. Portfolio Risk View - IMPROVED with HHI (Herfindahl-Hirschman Index)
     # HHI = Σ(weight_i²) - measures true portfolio concentration
     # Range: 0 (perfectly diversified) to 1 (single position)
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS ana_client_portfolio_risk AS
         WITH latest_snap AS (
           SELECT client_id, MAX(snapshot_id) as snap_id
@@ -768,7 +1230,7 @@ async def ensure_analytics_views():
     # E_adj = Σ E_i × e^(-λ × days_ago) where λ = ln(2)/half_life
     # Half-life = 14 days (event importance halves every 2 weeks)
     # SQLite approximation: decay_weight = 1 / (1 + days_ago/14)
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS ana_client_engagement_momentum AS
         WITH call_events AS (
           SELECT
@@ -871,7 +1333,7 @@ async def ensure_analytics_views():
     # 3. Conviction View - IMPROVED with Trade HHI and Time-Weighted Conviction
     # Uses notional value weights instead of just trade counts
     # Includes HHI for trading concentration and time decay for recency
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS ana_client_conviction AS
         WITH trade_values AS (
           SELECT
@@ -961,7 +1423,7 @@ async def ensure_analytics_views():
     """)
 
     # 4. Readership Intelligence View
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS ana_client_readership_intelligence AS
         WITH read_stats AS (
           SELECT
@@ -1001,7 +1463,7 @@ async def ensure_analytics_views():
     """)
 
     # 5. Enhanced Risk View
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS int_client_risk_enhanced AS
         SELECT
           cp.client_id,
@@ -1041,7 +1503,7 @@ async def ensure_analytics_views():
     """)
 
     # 6. Multi-Factor Risk Profile
-    await execute_write("""
+    statements.append("""
         CREATE VIEW IF NOT EXISTS int_client_risk_multifactor AS
         WITH
         investor_type_risk AS (
@@ -1090,49 +1552,47 @@ async def ensure_analytics_views():
             GROUP BY ps.client_id
         )
         SELECT
-            c.client_id,
-            c.client_type,
-            COALESCE(itr.type_risk_score, 0.50) AS investor_type_factor,
-            COALESCE(tb.turnover_risk_score, 0.40) AS trading_factor,
-            COALESCE(pos.position_risk_score, 0.40) AS position_factor,
-            ROUND(
-                0.40 * COALESCE(itr.type_risk_score, 0.50) +
-                0.35 * COALESCE(tb.turnover_risk_score, 0.40) +
-                0.25 * COALESCE(pos.position_risk_score, 0.40),
-                3
-            ) AS composite_risk_score,
+            client_id,
+            client_type,
+            investor_type_factor,
+            trading_factor,
+            position_factor,
+            ROUND(raw_score, 3) AS composite_risk_score,
             CASE
-                WHEN (0.40 * COALESCE(itr.type_risk_score, 0.50) +
-                      0.35 * COALESCE(tb.turnover_risk_score, 0.40) +
-                      0.25 * COALESCE(pos.position_risk_score, 0.40)) >= 0.60 THEN 'Aggressive'
-                WHEN (0.40 * COALESCE(itr.type_risk_score, 0.50) +
-                      0.35 * COALESCE(tb.turnover_risk_score, 0.40) +
-                      0.25 * COALESCE(pos.position_risk_score, 0.40)) >= 0.42 THEN 'Moderate'
+                WHEN raw_score >= 0.60 THEN 'Aggressive'
+                WHEN raw_score >= 0.42 THEN 'Moderate'
                 ELSE 'Conservative'
             END AS risk_category,
-            COALESCE(tb.trade_count, 0) AS trade_activity
-        FROM src_clients c
-        LEFT JOIN investor_type_risk itr ON itr.client_id = c.client_id
-        LEFT JOIN trading_behavior tb ON tb.client_id = c.client_id
-        LEFT JOIN position_size pos ON pos.client_id = c.client_id
+            trade_activity
+        FROM (
+            -- Composite computed once; categories use the unrounded score
+            SELECT
+                f.*,
+                0.40 * f.investor_type_factor +
+                0.35 * f.trading_factor +
+                0.25 * f.position_factor AS raw_score
+            FROM (
+                SELECT
+                    c.client_id,
+                    c.client_type,
+                    COALESCE(itr.type_risk_score, 0.50) AS investor_type_factor,
+                    COALESCE(tb.turnover_risk_score, 0.40) AS trading_factor,
+                    COALESCE(pos.position_risk_score, 0.40) AS position_factor,
+                    COALESCE(tb.trade_count, 0) AS trade_activity
+                FROM src_clients c
+                LEFT JOIN investor_type_risk itr ON itr.client_id = c.client_id
+                LEFT JOIN trading_behavior tb ON tb.client_id = c.client_id
+                LEFT JOIN position_size pos ON pos.client_id = c.client_id
+            ) f
+        ) scored
     """)
 
     # 7. Investment Style Classification
-    await execute_write("""
+    # Per-client trade counters live in mv_client_trade_agg, seeded here and
+    # kept current by triggers on src_trade_executions
+    statements.extend(MV_CLIENT_TRADE_AGG_STATEMENTS)
+    statements.append("""
         CREATE VIEW IF NOT EXISTS int_client_investment_style AS
-        WITH trade_analysis AS (
-            SELECT
-                client_id,
-                SUM(CASE WHEN theme_tag = 'AI' THEN 1 ELSE 0 END) AS ai_trades,
-                SUM(CASE WHEN theme_tag = 'EnergyTransition' THEN 1 ELSE 0 END) AS energy_trades,
-                SUM(CASE WHEN theme_tag = 'ESG' THEN 1 ELSE 0 END) AS esg_trades,
-                SUM(CASE WHEN sector = 'Tech' THEN 1 ELSE 0 END) AS tech_trades,
-                SUM(CASE WHEN sector = 'Healthcare' THEN 1 ELSE 0 END) AS healthcare_trades,
-                SUM(CASE WHEN sector = 'Financials' THEN 1 ELSE 0 END) AS financials_trades,
-                COUNT(*) AS total_trades
-            FROM src_trade_executions
-            GROUP BY client_id
-        )
         SELECT
             c.client_id,
             CASE
@@ -1159,11 +1619,11 @@ async def ensure_analytics_views():
                 ELSE 'Moderate'
             END AS activity_level
         FROM src_clients c
-        LEFT JOIN trade_analysis ta ON ta.client_id = c.client_id
+        LEFT JOIN mv_client_trade_agg ta ON ta.client_id = c.client_id
     """)
 
     # 8. Client Preferences Table (if not exists)
-    await execute_write("""
+    statements.append("""
         CREATE TABLE IF NOT EXISTS src_client_preferences (
             preference_id INTEGER PRIMARY KEY AUTOINCREMENT,
             client_id INTEGER UNIQUE,
@@ -1183,6 +1643,204 @@ async def ensure_analytics_views():
         )
     """)
 
+    # 9. Per-client lookup indexes on the base tables behind the ana_*/int_*
+    # views (views themselves cannot be indexed)
+    statements.extend(
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table}({cols})"
+        for name, table, cols in CLIENT_LOOKUP_INDEXES
+    )
+    statements.append("ANALYZE")
+
+    await execute_write_batch(statements)
+    await optimize_database()
+
+
+# How often (seconds) the running app lets SQLite refresh planner statistics
+SQLITE_OPTIMIZE_INTERVAL = int(os.environ.get("SQLITE_OPTIMIZE_INTERVAL", "3600"))
+
+_optimize_task: Optional[asyncio.Task] = None
+
+
+async def optimize_database():
+    """Run PRAGMA optimize so sqlite_stat1 stays current for the planner (SQLite only)."""
+    if DB_TYPE == "postgres":
+        return
+    await execute_write("PRAGMA optimize")
+
+
+async def _periodic_optimize():
+    while True:
+        await asyncio.sleep(SQLITE_OPTIMIZE_INTERVAL)
+        try:
+            await optimize_database()
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+
+
+def _fts_index_statements(table: str, key: str, columns: Tuple[str, ...]) -> List[str]:
+    """DDL for an external-content trigram FTS5 index on `table`, kept in sync by triggers."""
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+        {cols},
+        content='{table}', content_rowid='{key}', tokenize='trigram'
+    )
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(rowid, {cols}) VALUES (new.{key}, {new_cols});
+    END
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {cols})
+        VALUES ('delete', old.{key}, {old_cols});
+    END
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {cols})
+        VALUES ('delete', old.{key}, {old_cols});
+        INSERT INTO {fts}(rowid, {cols}) VALUES (new.{key}, {new_cols});
+    END
+    """,
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+# Trigram full-text index over the searchable client fields. Column order
+# matches the bm25 weights: contact name > firm name > client name > rest.
+CLIENT_FTS_COLUMNS = ("primary_contact_name", "firm_name", "client_name", "region", "client_type")
+CLIENT_FTS_RANK = "bm25(10.0, 8.0, 5.0, 1.0, 1.0)"
+
+CLIENT_FTS_STATEMENTS = _fts_index_statements("src_clients", "client_id", CLIENT_FTS_COLUMNS) + [
+    f"INSERT INTO src_clients_fts(src_clients_fts, rank) VALUES ('rank', '{CLIENT_FTS_RANK}')",
+]
+
+# Same trigram index over the fields the analyst stock picker searches
+STOCK_FTS_COLUMNS = ("ticker", "company_name", "sector")
+STOCK_FTS_STATEMENTS = _fts_index_statements("src_stocks", "stock_id", STOCK_FTS_COLUMNS)
+
+# Set once the FTS index exists; search falls back to LIKE otherwise
+_client_fts_ready = False
+_stock_fts_ready = False
+
+
+async def ensure_client_search_index():
+    """Create/rebuild the client FTS5 index (SQLite builds with trigram support only)."""
+    global _client_fts_ready
+    if DB_TYPE == "postgres":
+        return
+    try:
+        await execute_write_batch(CLIENT_FTS_STATEMENTS)
+        _client_fts_ready = True
+    except sqlite3.Error as e:
+        logger.warning(f"Client FTS index unavailable, using LIKE search: {e}")
+
+
+async def ensure_stock_search_index():
+    """Create/rebuild the src_stocks FTS5 index (Postgres uses the pg_trgm migration)."""
+    global _stock_fts_ready
+    if DB_TYPE == "postgres":
+        return
+    try:
+        await execute_write_batch(STOCK_FTS_STATEMENTS)
+        _stock_fts_ready = True
+    except sqlite3.Error as e:
+        logger.warning(f"Stock FTS index unavailable, using LIKE search: {e}")
+
+
+# Audit rows are written by a background task in batches: concurrent
+# generations share one transaction instead of paying a commit each. The
+# caller still waits for its row to be committed, so the id it returns is
+# always persisted. SQLite assigns generation_id itself (safe across worker
+# processes); on Postgres the key column is a UUID `id` generated here.
+AUDIT_BATCH_MAX = 100
+
+if DB_TYPE == "postgres":
+    LOG_GENERATION_SQL = """
+    INSERT INTO ai_generation_history
+    (id, client_id, generation_type, model_used, ticker, mode, instruction, prompt_text, response_text)
+    VALUES (:generation_id, :client_id, :generation_type, :model_used, :ticker, :mode, :instruction, :prompt_text, :response_text)
+"""
+else:
+    LOG_GENERATION_SQL = """
+    INSERT INTO ai_generation_history
+    (client_id, generation_type, model_used, ticker, mode, instruction, prompt_text, response_text)
+    VALUES (:client_id, :generation_type, :model_used, :ticker, :mode, :instruction, :prompt_text, :response_text)
+"""
+
+_audit_queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = asyncio.Queue()
+_audit_task: Optional[asyncio.Task] = None
+
+
+async def _insert_audit_rows(rows: List[Dict[str, Any]]) -> List[Union[int, str]]:
+    """Insert audit rows in one transaction and return their ids."""
+    if DB_TYPE == "postgres":
+        await execute_many(LOG_GENERATION_SQL, rows)
+        return [row["generation_id"] for row in rows]
+    return await execute_insert_many(LOG_GENERATION_SQL, rows)
+
+
+async def _write_audit_batch(batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+    """Write a batch and resolve each row's future with its id or error.
+
+    If the batch transaction fails, rows are retried one at a time so a
+    single bad row doesn't take the others down with it.
+    """
+    try:
+        ids = await _insert_audit_rows([row for row, _ in batch])
+        results = list(zip(batch, ids))
+    except Exception as e:
+        if len(batch) == 1:
+            results = [(batch[0], e)]
+        else:
+            logger.warning(f"Audit batch of {len(batch)} rows failed, retrying row by row: {e}")
+            results = []
+            for item in batch:
+                try:
+                    results.append((item, (await _insert_audit_rows([item[0]]))[0]))
+                except Exception as row_error:
+                    results.append((item, row_error))
+    for (_, future), result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Failed to write audit row: {result}")
+            if not future.done():
+                future.set_exception(result)
+        elif not future.done():
+            future.set_result(result)
+
+
+async def _audit_writer():
+    while True:
+        batch = [await _audit_queue.get()]
+        while len(batch) < AUDIT_BATCH_MAX and not _audit_queue.empty():
+            batch.append(_audit_queue.get_nowait())
+        try:
+            await _write_audit_batch(batch)
+        finally:
+            for _ in batch:
+                _audit_queue.task_done()
+
+
+async def start_audit_writer():
+    global _audit_task
+    _audit_task = asyncio.create_task(_audit_writer())
+
+
+async def stop_audit_writer():
+    """Write whatever is still queued, then stop the writer."""
+    global _audit_task
+    if _audit_task is None:
+        return
+    await _audit_queue.join()
+    _audit_task.cancel()
+    _audit_task = None
+
 
 async def log_generation(
     client_id: int,
@@ -1193,29 +1851,36 @@ async def log_generation(
     mode: Optional[str] = None,
     instruction: Optional[str] = None,
     prompt_text: Optional[str] = None,
-) -> int:
-    """Save a generation to the audit trail. Returns generation_id."""
-    return await execute_write(
-        """
-        INSERT INTO ai_generation_history
-        (client_id, generation_type, model_used, ticker, mode, instruction, prompt_text, response_text)
-        VALUES (:client_id, :generation_type, :model_used, :ticker, :mode, :instruction, :prompt_text, :response_text)
-        """,
-        {
-            "client_id": client_id,
-            "generation_type": generation_type,
-            "model_used": model_used,
-            "ticker": ticker,
-            "mode": mode,
-            "instruction": instruction,
-            "prompt_text": prompt_text,
-            "response_text": response_text,
-        }
-    )
+) -> Union[int, str]:
+    """Log a generation to the audit trail and return its id once written.
+
+    The id is an int generation_id on SQLite and a UUID string on Postgres.
+    Raises if the row could not be written.
+    """
+    row = {
+        "generation_id": str(uuid.uuid4()) if DB_TYPE == "postgres" else None,
+        "client_id": client_id,
+        "generation_type": generation_type,
+        "model_used": model_used,
+        "ticker": ticker,
+        "mode": mode,
+        "instruction": instruction,
+        "prompt_text": prompt_text,
+        "response_text": response_text,
+    }
+    if _audit_task is None:
+        # No writer running (e.g. called outside the app lifecycle)
+        return (await _insert_audit_rows([row]))[0]
+    future = asyncio.get_running_loop().create_future()
+    _audit_queue.put_nowait((row, future))
+    return await future
 
 
 async def get_generation_history(client_id: int, limit: int = 50) -> List[Dict[str, Any]]:
     """Get generation history for a client."""
+    if _audit_task is not None:
+        # Make just-generated entries visible
+        await _audit_queue.join()
     return await fetch_all(
         """
         SELECT
@@ -1242,32 +1907,13 @@ async def get_generation_history(client_id: int, limit: int = 50) -> List[Dict[s
 # Core data access (matches your schema)
 # =========================
 
-async def search_clients(q: str, limit: int = 20) -> List[Dict[str, Any]]:
-    """
-    Fuzzy search for clients.
-    - Splits query into terms
-    - Matches each term against multiple fields
-    - Scores by number of matching terms and field priority
-    - Returns sorted by relevance
-    """
-    q = q.strip().lower()
-    if not q:
-        return []
-
-    # Split into terms for fuzzy matching
-    terms = [t.strip() for t in q.split() if t.strip()]
-    if not terms:
-        return []
-
+def _build_search_sql(n_terms: int) -> str:
+    """Build the client search SQL for a fixed number of terms (:t0, :exact0, :starts0, ...)."""
     # Build dynamic WHERE clause for each term
     # Each term must match at least one field (AND logic for terms)
     # Within a term, match any field (OR logic for fields)
     where_parts = []
-    params = {}
-
-    for i, term in enumerate(terms):
-        term_pattern = f"%{term}%"
-        params[f"t{i}"] = term_pattern
+    for i in range(n_terms):
         where_parts.append(f"""
             (LOWER(COALESCE(primary_contact_name, '')) LIKE :t{i}
              OR LOWER(COALESCE(client_name, '')) LIKE :t{i}
@@ -1283,11 +1929,7 @@ async def search_clients(q: str, limit: int = 20) -> List[Dict[str, Any]]:
     # - Starts with term in any field: high priority
     # - Contains term: lower priority
     score_parts = []
-    for i, term in enumerate(terms):
-        exact_pattern = term
-        starts_pattern = f"{term}%"
-        params[f"exact{i}"] = exact_pattern
-        params[f"starts{i}"] = starts_pattern
+    for i in range(n_terms):
         score_parts.append(f"""
             CASE WHEN LOWER(primary_contact_name) = :exact{i} THEN 100 ELSE 0 END +
             CASE WHEN LOWER(firm_name) = :exact{i} THEN 80 ELSE 0 END +
@@ -1299,9 +1941,8 @@ async def search_clients(q: str, limit: int = 20) -> List[Dict[str, Any]]:
         """)
 
     score_calc = " + ".join(score_parts)
-    params["limit"] = limit
 
-    sql = f"""
+    return f"""
         SELECT
             client_id,
             client_name,
@@ -1317,27 +1958,65 @@ async def search_clients(q: str, limit: int = 20) -> List[Dict[str, Any]]:
         LIMIT :limit
     """
 
-    return await fetch_all(sql, params)
 
-async def get_client_header(client_id: int) -> Dict[str, Any]:
-    row = await fetch_one(
-        """
-        SELECT
-            client_id,
-            client_name,
-            firm_name,
-            client_type,
-            region,
-            primary_contact_name,
-            primary_contact_role
-        FROM src_clients
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    if not row:
-        raise ValueError(f"Client not found for client_id={client_id}")
-    return row
+# Pre-built search SQL for the common term counts; identical SQL text per
+# term count lets the driver reuse the prepared statement.
+_SEARCH_SQL: Dict[int, str] = {n: _build_search_sql(n) for n in range(1, 6)}
+
+# FTS5 search: every term must match (implicit AND); rows come back in
+# bm25 rank order (weights configured on the index), so no sort is needed.
+CLIENT_FTS_SEARCH_SQL = """
+    SELECT
+        c.client_id,
+        c.client_name,
+        c.firm_name,
+        c.client_type,
+        c.region,
+        c.primary_contact_name,
+        c.primary_contact_role,
+        ROUND(-f.rank, 4) AS relevance_score
+    FROM src_clients_fts f
+    JOIN src_clients c ON c.client_id = f.rowid
+    WHERE src_clients_fts MATCH :q
+    ORDER BY f.rank
+    LIMIT :limit
+"""
+
+# Trigram tokens need at least 3 characters
+_FTS_MIN_TERM_LEN = 3
+
+
+async def search_clients(q: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Fuzzy search for clients.
+    - Splits query into terms
+    - Matches each term against multiple fields
+    - Scores by number of matching terms and field priority
+    - Returns sorted by relevance
+    Uses the FTS5 trigram index (bm25 rank) when every term has 3+ chars,
+    otherwise the LIKE-based scoring below.
+    """
+    q = q.strip().lower()
+    if not q:
+        return []
+
+    # Split into terms for fuzzy matching
+    terms = [t.strip() for t in q.split() if t.strip()]
+    if not terms:
+        return []
+
+    if _client_fts_ready and min(len(t) for t in terms) >= _FTS_MIN_TERM_LEN:
+        match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        return await fetch_all(CLIENT_FTS_SEARCH_SQL, {"q": match, "limit": limit})
+
+    params: Dict[str, Any] = {"limit": limit}
+    for i, term in enumerate(terms):
+        params[f"t{i}"] = f"%{term}%"
+        params[f"exact{i}"] = term
+        params[f"starts{i}"] = f"{term}%"
+
+    sql = _SEARCH_SQL.get(len(terms)) or _build_search_sql(len(terms))
+    return await fetch_all(sql, params)
 
 async def get_client_profile(client_id: int) -> Dict[str, Any]:
     row = await fetch_one(
@@ -1385,25 +2064,6 @@ async def get_client_portfolio_summary(client_id: int) -> Dict[str, Any]:
     )
     return row or {}
 
-async def get_client_availability(client_id: int) -> Dict[str, Any]:
-    row = await fetch_one(
-        """
-        SELECT
-            best_day,
-            best_hour,
-            best_time_window,
-            availability_score,
-            availability_confidence,
-            call_count,
-            avg_call_duration_min,
-            updated_at
-        FROM int_client_availability
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
 async def get_latest_portfolio_snapshot_id(client_id: int) -> Optional[int]:
     row = await fetch_one(
         """
@@ -1415,37 +2075,57 @@ async def get_latest_portfolio_snapshot_id(client_id: int) -> Optional[int]:
         """,
         {"client_id": client_id},
     )
-    return int(row["snapshot_id"]) if row and row.get("snapshot_id") is not None else None
+    return row["snapshot_id"] if row else None
 
 async def get_top_positions(client_id: int, limit: int = 15) -> List[Dict[str, Any]]:
     snap_id = await get_latest_portfolio_snapshot_id(client_id)
     if not snap_id:
         return []
 
-    return await fetch_all(
+    rows = await fetch_all(
         """
         SELECT
-            p.position_id,
-            p.snapshot_id,
-            p.stock_id,
-            s.ticker,
-            s.company_name,
-            s.sector,
-            s.theme_tag,
-            p.quantity,
-            p.avg_cost,
-            p.market_value,
-            p.weight,
-            p.currency
-        FROM src_positions p
-        JOIN src_stocks s ON s.stock_id = p.stock_id
-        WHERE p.snapshot_id = :snapshot_id
-        ORDER BY p.weight DESC, p.market_value DESC
+            position_id,
+            snapshot_id,
+            stock_id,
+            quantity,
+            avg_cost,
+            market_value,
+            weight,
+            currency
+        FROM src_positions
+        WHERE snapshot_id = :snapshot_id
+        ORDER BY weight DESC, market_value DESC
         LIMIT :limit
         """,
         {"snapshot_id": snap_id, "limit": limit},
     )
 
+    # Static stock fields come from the in-process cache instead of a JOIN
+    stocks = await get_stock_cache()
+    out = []
+    for r in rows:
+        s = stocks.get(r["stock_id"])
+        if s is None:
+            continue
+        out.append(
+            {
+                "position_id": r["position_id"],
+                "snapshot_id": r["snapshot_id"],
+                "stock_id": r["stock_id"],
+                "ticker": s["ticker"],
+                "company_name": s["company_name"],
+                "sector": s["sector"],
+                "theme_tag": s["theme_tag"],
+                "quantity": r["quantity"],
+                "avg_cost": r["avg_cost"],
+                "market_value": r["market_value"],
+                "weight": r["weight"],
+                "currency": r["currency"],
+            }
+        )
+    return out
+
 async def get_recent_trades(client_id: int, limit: int = 15) -> List[Dict[str, Any]]:
     return await fetch_all(
         """
@@ -1468,31 +2148,35 @@ async def get_recent_trades(client_id: int, limit: int = 15) -> List[Dict[str, A
     )
 
 async def get_recent_calls(client_id: int, limit: int = 8) -> List[Dict[str, Any]]:
-    return await fetch_all(
+    rows = await fetch_all(
         """
         SELECT
-            c.call_id,
-            c.call_timestamp,
-            c.direction,
-            c.duration_minutes,
-            c.discussed_company,
-            c.discussed_sector,
-            c.related_report_id,
-            c.notes_raw,
-            c.stock_id,
-            s.ticker AS stock_ticker,
-            s.company_name AS stock_company_name,
-            s.sector AS stock_sector,
-            s.theme_tag AS stock_theme_tag
-        FROM src_call_logs c
-        LEFT JOIN src_stocks s ON s.stock_id = c.stock_id
-        WHERE c.client_id = :client_id
-        ORDER BY c.call_timestamp DESC, c.call_id DESC
+            call_id,
+            call_timestamp,
+            direction,
+            duration_minutes,
+            discussed_company,
+            discussed_sector,
+            related_report_id,
+            notes_raw,
+            stock_id
+        FROM src_call_logs
+        WHERE client_id = :client_id
+        ORDER BY call_timestamp DESC, call_id DESC
         LIMIT :limit
         """,
         {"client_id": client_id, "limit": limit},
     )
 
+    stocks = await get_stock_cache()
+    for r in rows:
+        s = stocks.get(r["stock_id"]) or {}
+        r["stock_ticker"] = s.get("ticker")
+        r["stock_company_name"] = s.get("company_name")
+        r["stock_sector"] = s.get("sector")
+        r["stock_theme_tag"] = s.get("theme_tag")
+    return rows
+
 async def get_recent_reads_daysdiff(client_id: int, limit: int = 12) -> List[Dict[str, Any]]:
     return await fetch_all(
         """
@@ -1537,129 +2221,10 @@ async def get_call_position_hints(client_id: int, limit: int = 20) -> List[Dict[
         {"client_id": client_id, "limit": limit},
     )
 
-async def get_topic_signals(client_id: int) -> Dict[str, Any]:
-    row = await fetch_one(
-        """
-        SELECT
-            top_topic,
-            top_topic_share,
-            top_topic_count,
-            last_signal_ts
-        FROM ana_client_topic_signals
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-async def get_trade_summary(client_id: int) -> Dict[str, Any]:
-    row = await fetch_one(
-        """
-        SELECT
-            trade_count,
-            top_sector,
-            top_sector_share,
-            top_theme,
-            top_theme_share,
-            buy_rate,
-            side_bias,
-            size_proxy,
-            herfindahl_concentration,
-            last_trade_ts
-        FROM ana_client_trade_summary
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-async def get_call_patterns(client_id: int) -> Dict[str, Any]:
-    row = await fetch_one(
-        """
-        SELECT
-            call_count,
-            avg_call_duration,
-            best_weekday_num,
-            best_hour,
-            best_time_window,
-            timing_confidence,
-            last_call_ts
-        FROM ana_client_call_patterns
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-async def get_readership_summary(client_id: int) -> Dict[str, Any]:
-    row = await fetch_one(
-        """
-        SELECT
-            reads_n,
-            avg_days_diff,
-            late_read_ratio,
-            last_read_ts
-        FROM ana_client_readership_summary
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-
 # =========================
 # ENHANCED ANALYTICS (new views)
 # =========================
 
-async def get_portfolio_risk(client_id: int) -> Dict[str, Any]:
-    """Get portfolio-level risk metrics including HHI concentration."""
-    row = await fetch_one(
-        """
-        SELECT
-            portfolio_volatility,
-            max_position_weight,
-            total_positions,
-            large_positions,
-            avg_stock_volatility,
-            high_vol_exposure,
-            hhi_concentration,
-            effective_num_positions,
-            hhi_risk_level,
-            volatility_risk_level,
-            concentration_risk_level
-        FROM ana_client_portfolio_risk
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-
-async def get_engagement_momentum(client_id: int) -> Dict[str, Any]:
-    """Get engagement momentum with time-decayed scoring and trade probability."""
-    row = await fetch_one(
-        """
-        SELECT
-            calls_last_30d,
-            calls_prior_30d,
-            call_momentum,
-            trades_last_30d,
-            trades_prior_30d,
-            trade_momentum,
-            recent_buy_ratio,
-            large_trades_30d,
-            engagement_score_decayed,
-            engagement_score_30d,
-            engagement_trend,
-            trade_probability
-        FROM ana_client_engagement_momentum
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-
 async def get_conviction(client_id: int) -> Dict[str, Any]:
     """Get client's top conviction stock with trade HHI concentration."""
     row = await fetch_one(
@@ -1684,54 +2249,6 @@ async def get_conviction(client_id: int) -> Dict[str, Any]:
     return row or {}
 
 
-async def get_readership_intelligence(client_id: int) -> Dict[str, Any]:
-    """Get enhanced readership metrics (velocity, breadth, preferences)."""
-    row = await fetch_one(
-        """
-        SELECT
-            total_reads,
-            sector_breadth,
-            preferred_report_type,
-            preferred_sector,
-            avg_read_delay_days,
-            read_velocity_score,
-            same_day_read_ratio,
-            reader_speed_type,
-            reader_breadth_type,
-            readership_quality_score
-        FROM ana_client_readership_intelligence
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-
-async def get_enhanced_risk(client_id: int) -> Dict[str, Any]:
-    """Get enhanced risk assessment combining all signals."""
-    row = await fetch_one(
-        """
-        SELECT
-            original_risk_appetite,
-            enhanced_risk_level,
-            enhanced_risk_score,
-            portfolio_volatility,
-            volatility_risk_level,
-            concentration_risk_level,
-            engagement_trend,
-            trade_momentum,
-            top_conviction_stock,
-            conviction_level,
-            sentiment_signal,
-            action_signal
-        FROM int_client_risk_enhanced
-        WHERE client_id = :client_id
-        """,
-        {"client_id": client_id},
-    )
-    return row or {}
-
-
 async def get_sector_momentum() -> List[Dict[str, Any]]:
     """Get market-wide sector flow signals."""
     return await fetch_all(
@@ -1750,10 +2267,128 @@ async def get_sector_momentum() -> List[Dict[str, Any]]:
     )
 
 
+# =========================
+# Client bundle (all single-row sections in one round trip)
+# =========================
+
+# (bundle key, relation, columns) - every single-row section of the client
+# context; build_client_context reads them all through get_client_bundle.
+CLIENT_BUNDLE_SECTIONS: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("header", "src_clients", (
+        "client_id", "client_name", "firm_name", "client_type", "region",
+        "primary_contact_name", "primary_contact_role",
+    )),
+    ("profile", "int_client_profile", (
+        "engagement_level", "investment_style", "risk_score", "risk_appetite",
+        "dominant_topic", "dominant_topic_share", "dominant_theme",
+        "profile_confidence_score", "profile_confidence_level", "updated_at",
+    )),
+    ("portfolio_summary", "int_client_portfolio_summary", (
+        "trade_count", "top_sector", "top_sector_share", "top_theme", "top_theme_share",
+        "buy_rate", "side_bias", "size_proxy", "concentration_index", "concentration_flag",
+        "direction_flag", "activity_flag", "size_aggressiveness_score", "updated_at",
+    )),
+    ("availability", "int_client_availability", (
+        "best_day", "best_hour", "best_time_window", "availability_score",
+        "availability_confidence", "call_count", "avg_call_duration_min", "updated_at",
+    )),
+    ("readership_summary", "ana_client_readership_summary", (
+        "reads_n", "avg_days_diff", "late_read_ratio", "last_read_ts",
+    )),
+    ("topic_signals", "ana_client_topic_signals", (
+        "top_topic", "top_topic_share", "top_topic_count", "last_signal_ts",
+    )),
+    ("trade_summary", "ana_client_trade_summary", (
+        "trade_count", "top_sector", "top_sector_share", "top_theme", "top_theme_share",
+        "buy_rate", "side_bias", "size_proxy", "herfindahl_concentration", "last_trade_ts",
+    )),
+    ("call_patterns", "ana_client_call_patterns", (
+        "call_count", "avg_call_duration", "best_weekday_num", "best_hour",
+        "best_time_window", "timing_confidence", "last_call_ts",
+    )),
+    ("portfolio_risk", "ana_client_portfolio_risk", (
+        "portfolio_volatility", "max_position_weight", "total_positions", "large_positions",
+        "avg_stock_volatility", "high_vol_exposure", "hhi_concentration",
+        "effective_num_positions", "hhi_risk_level", "volatility_risk_level",
+        "concentration_risk_level",
+    )),
+    ("engagement_momentum", "ana_client_engagement_momentum", (
+        "calls_last_30d", "calls_prior_30d", "call_momentum", "trades_last_30d",
+        "trades_prior_30d", "trade_momentum", "recent_buy_ratio", "large_trades_30d",
+        "engagement_score_decayed", "engagement_score_30d", "engagement_trend",
+        "trade_probability",
+    )),
+    ("conviction", "ana_client_conviction", (
+        "top_conviction_stock", "top_conviction_stock_id", "trade_count", "call_mentions",
+        "net_direction", "trade_concentration", "conviction_score", "trade_hhi",
+        "effective_stocks_traded", "conviction_level", "sentiment_signal",
+    )),
+    ("readership_intelligence", "ana_client_readership_intelligence", (
+        "total_reads", "sector_breadth", "preferred_report_type", "preferred_sector",
+        "avg_read_delay_days", "read_velocity_score", "same_day_read_ratio",
+        "reader_speed_type", "reader_breadth_type", "readership_quality_score",
+    )),
+    ("enhanced_risk", "int_client_risk_enhanced", (
+        "original_risk_appetite", "enhanced_risk_level", "enhanced_risk_score",
+        "portfolio_volatility", "volatility_risk_level", "concentration_risk_level",
+        "engagement_trend", "trade_momentum", "top_conviction_stock", "conviction_level",
+        "sentiment_signal", "action_signal",
+    )),
+]
+
+
+def _build_client_bundle_sql() -> str:
+    """Build one SELECT returning every bundle section as a JSON document.
+
+    Each section is a scalar subquery filtered on the bound :client_id rather
+    than a LEFT JOIN off a driver row: most sections are aggregate views, and
+    SQLite only pushes the client_id filter into them when it compares against
+    a parameter. Joined/correlated forms materialize whole views and were
+    ~1.6-2x slower on data.db.
+    """
+    if DB_TYPE == "postgres":
+        json_fn = "json_build_object"
+        value = "{}"
+    else:
+        json_fn = "json_object"
+        # json_object renders REAL with 15 significant digits; 17 round-trip
+        # exactly, so floats come back as stored (as with a plain SELECT).
+        value = "CASE typeof({0}) WHEN 'real' THEN json(printf('%!.17g', {0})) ELSE {0} END"
+    parts = []
+    for key, relation, columns in CLIENT_BUNDLE_SECTIONS:
+        fields = ", ".join(f"'{c}', {value.format(c)}" for c in columns)
+        parts.append(
+            f"'{key}', (SELECT {json_fn}({fields}) FROM {relation} "
+            f"WHERE client_id = :client_id LIMIT 1)"
+        )
+    return f"SELECT {json_fn}(\n    " + ",\n    ".join(parts) + "\n) AS bundle"
+
+
+CLIENT_BUNDLE_SQL = _build_client_bundle_sql()
+
+
+async def get_client_bundle(client_id: int) -> Dict[str, Any]:
+    """Fetch header + all single-row analytics sections in one query.
+
+    Missing sections come back as {}, as they did when each section was
+    fetched by its own query.
+    Raises ValueError if the client does not exist.
+    """
+    row = await fetch_one(CLIENT_BUNDLE_SQL, {"client_id": client_id})
+    bundle = (row or {}).get("bundle")
+    if isinstance(bundle, str):
+        bundle = json.loads(bundle)
+    bundle = bundle or {}
+    if not bundle.get("header"):
+        raise ValueError(f"Client not found for client_id={client_id}")
+    return {key: bundle.get(key) or {} for key, _, _ in CLIENT_BUNDLE_SECTIONS}
+
+
 # =========================
 # Stock universe + market fields (based ONLY on your tables)
 # =========================
 
+@async_ttl_cache(ttl=60, tables=("src_stocks",))
 async def get_stock_by_ticker(ticker: str) -> Optional[Dict[str, Any]]:
     return await fetch_one(
         """
@@ -1772,97 +2407,129 @@ async def get_stock_by_ticker(ticker: str) -> Optional[Dict[str, Any]]:
         {"ticker": ticker},
     )
 
-async def get_stock_market_fields(stock_ids: List[int]) -> Dict[int, Dict[str, Any]]:
-    """Returns latest close + latest vol fields for each stock_id."""
-    if not stock_ids:
-        return {}
+def _json_ids_subquery(param: str) -> str:
+    """Subquery expanding a JSON array of ints bound as :param.
 
-    out: Dict[int, Dict[str, Any]] = {int(sid): {} for sid in stock_ids}
+    Binding the whole list as one parameter keeps the SQL text identical for
+    any list length, so the prepared statement is reused.
+    """
+    if DB_TYPE == "postgres":
+        return f"SELECT CAST(value AS INTEGER) AS value FROM json_array_elements_text(CAST(:{param} AS json))"
+    return f"SELECT value FROM json_each(:{param})"
+
+
+# Latest price + latest vol row per requested stock in one statement.
+# Driven from the id list, each stock's MAX(date) is a single probe of the
+# (stock_id, date) index followed by a point lookup, instead of aggregating
+# every date for every stock. Stocks without data still get a row (NULLs).
+# Labels produced by the vol_bucket CASE below
+VOL_BUCKETS = frozenset(("low", "medium", "high", "unknown"))
+
+MARKET_FIELDS_SQL = f"""
+    SELECT
+        ids.value AS stock_id,
+        p.close AS last_close,
+        p.currency AS price_currency,
+        p.price_date,
+        v.vol_20d,
+        v.vol_60d,
+        v.vol_date,
+        CASE
+            WHEN v.vol_60d IS NULL THEN 'unknown'
+            WHEN v.vol_60d < 0.20 THEN 'low'
+            WHEN v.vol_60d < 0.35 THEN 'medium'
+            ELSE 'high'
+        END AS vol_bucket
+    FROM ({_json_ids_subquery("ids")}) ids
+    LEFT JOIN src_stock_prices p
+      ON p.stock_id = ids.value
+     AND p.price_date = (
+        SELECT MAX(price_date) FROM src_stock_prices WHERE stock_id = ids.value
+     )
+    LEFT JOIN src_stock_volatility v
+      ON v.stock_id = ids.value
+     AND v.vol_date = (
+        SELECT MAX(vol_date) FROM src_stock_volatility WHERE stock_id = ids.value
+     )
+"""
 
-    # SQLite (uses IN (...))
-    placeholders = ",".join([":id" + str(i) for i in range(len(stock_ids))])
-    id_params = {"id" + str(i): int(stock_ids[i]) for i in range(len(stock_ids))}
 
-    prices = await fetch_all(
-        f"""
-        SELECT p.stock_id, p.close, p.currency, p.price_date
-        FROM src_stock_prices p
-        JOIN (
-            SELECT stock_id, MAX(price_date) AS max_date
-            FROM src_stock_prices
-            WHERE stock_id IN ({placeholders})
-            GROUP BY stock_id
-        ) mx
-          ON mx.stock_id = p.stock_id AND mx.max_date = p.price_date
-        """,
-        id_params,
-    )
+# Latest close/vol per stock_id; prices move at most daily and writes to
+# the price/vol tables clear it.
+MARKET_CACHE_TTL = 300
+_market_cache = SimpleCache(max_entries=4096)
+for _table in ("src_stock_prices", "src_stock_volatility"):
+    _CACHES_BY_TABLE.setdefault(_table, []).append(_market_cache)
+del _table
 
-    vols = await fetch_all(
-        f"""
-        SELECT v.stock_id, v.vol_20d, v.vol_60d, v.vol_date
-        FROM src_stock_volatility v
-        JOIN (
-            SELECT stock_id, MAX(vol_date) AS max_date
-            FROM src_stock_volatility
-            WHERE stock_id IN ({placeholders})
-            GROUP BY stock_id
-        ) mx
-          ON mx.stock_id = v.stock_id AND mx.max_date = v.vol_date
-        """,
-        id_params,
-    )
 
-    for r in prices:
-        out[int(r["stock_id"])].update(
-            {
-                "last_close": r.get("close"),
-                "price_currency": r.get("currency"),
-                "price_date": r.get("price_date"),
-            }
-        )
-    for r in vols:
-        out[int(r["stock_id"])].update(
-            {
-                "vol_20d": r.get("vol_20d"),
-                "vol_60d": r.get("vol_60d"),
-                "vol_date": r.get("vol_date"),
-            }
-        )
-    return out
+async def get_stock_market_fields(stock_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Returns latest close + latest vol fields (incl. vol_bucket) for each stock_id."""
+    if not stock_ids:
+        return {}
 
-def vol_bucket(vol_60d: Optional[float]) -> str:
-    # Only bucket if we have a number; otherwise unknown
-    if vol_60d is None:
-        return "unknown"
-    try:
-        v = float(vol_60d)
-    except Exception:
-        return "unknown"
-    # simple buckets (no external market assumptions)
-    if v < 0.20:
-        return "low"
-    if v < 0.35:
-        return "medium"
-    return "high"
+    ids = list(dict.fromkeys(int(sid) for sid in stock_ids))
+    out: Dict[int, Dict[str, Any]] = {}
+    missing = []
+    for sid in ids:
+        hit = _market_cache.get(sid)
+        if hit is None:
+            missing.append(sid)
+        else:
+            out[sid] = hit
+    if missing:
+        rows = await fetch_all(MARKET_FIELDS_SQL, {"ids": json.dumps(missing)})
+        for r in rows:
+            sid = int(r["stock_id"])
+            out[sid] = {
+                "last_close": r["last_close"],
+                "price_currency": r["price_currency"],
+                "price_date": r["price_date"],
+                "vol_20d": r["vol_20d"],
+                "vol_60d": r["vol_60d"],
+                "vol_date": r["vol_date"],
+                "vol_bucket": r["vol_bucket"],
+            }
+            _market_cache.set(sid, out[sid], MARKET_CACHE_TTL)
+    return {sid: out[sid] for sid in ids if sid in out}
 
 
 # =========================
 # Build client context (DB-only)
 # =========================
 
-async def build_avoid_tickers(client_id: int) -> List[str]:
-    avoid = set()
-
-    for h in await get_top_positions(client_id, limit=15):
-        if h.get("ticker"):
-            avoid.add(h["ticker"])
+# Source tables behind the client context / candidate universe; a write
+# mentioning any of them clears the cached results below.
+CLIENT_CONTEXT_TABLES = (
+    "src_clients",
+    "src_client_compliance",
+    "src_call_logs",
+    "src_trade_executions",
+    "src_portfolio_snapshots",
+    "src_positions",
+    "src_readership_events",
+    "src_reports",
+    "src_stocks",
+    "src_stock_volatility",
+)
+
+
+def _avoid_from(
+    top_positions: List[Dict[str, Any]], recent_trades: List[Dict[str, Any]]
+) -> List[str]:
+    """Tickers already held or recently traded (sorted, unique)."""
+    return sorted(
+        {h["ticker"] for h in top_positions if h.get("ticker")}
+        | {t["ticker"] for t in recent_trades if t.get("ticker")}
+    )
 
-    for t in await get_recent_trades(client_id, limit=15):
-        if t.get("ticker"):
-            avoid.add(t["ticker"])
 
-    return sorted(avoid)
+async def build_avoid_tickers(client_id: int) -> List[str]:
+    top_positions, recent_trades = await asyncio.gather(
+        get_top_positions(client_id, limit=15),
+        get_recent_trades(client_id, limit=15),
+    )
+    return _avoid_from(top_positions, recent_trades)
 
 
 async def get_client_compliance_restrictions(client_id: int) -> Dict[str, Any]:
@@ -1942,11 +2609,11 @@ async def get_client_compliance_restrictions(client_id: int) -> Dict[str, Any]:
     return restrictions
 
 
-async def filter_stocks_by_compliance(stocks: List[Dict[str, Any]], restrictions: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _iter_compliant(stocks: Iterable[Dict[str, Any]], restrictions: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
     """
-    Filter stocks based on compliance restrictions.
+    Yield the stocks that pass compliance restrictions, lazily so callers can
+    stop as soon as they have enough.
     """
-    filtered = []
     restricted_sectors = [s.lower() for s in restrictions.get("restricted_sectors", [])]
     volatility_limit = restrictions.get("volatility_limit")
 
@@ -1965,11 +2632,43 @@ async def filter_stocks_by_compliance(stocks: List[Dict[str, Any]], restrictions
             if volatility_limit == "medium" and vol == "high":
                 continue
 
-        filtered.append(stock)
+        yield stock
+
+CANDIDATE_COLUMNS = """
+    stock_id,
+    company_name,
+    ticker,
+    sector,
+    region,
+    market_cap_bucket,
+    theme_tag,
+    volatility,
+    dividend_yield,
+    beta,
+    created_at
+"""
+
+def _inlist(prefix: str, values: Iterable[Any]) -> Tuple[str, Dict[str, Any]]:
+    """Named placeholders ":p0,:p1,..." for an IN (...) list plus their bindings."""
+    bound = {f"{prefix}{i}": v for i, v in enumerate(values)}
+    return ",".join(":" + k for k in bound), bound
 
-    return filtered
 
-async def build_candidate_universe(client_id: int, max_candidates: int = 120) -> List[Dict[str, Any]]:
+# Minimum number of rows each sector/theme and diversifier arm may return
+CANDIDATE_ARM_LIMIT = 120
+
+
+async def _no_rows() -> List[Dict[str, Any]]:
+    """Placeholder for a skipped query inside an asyncio.gather."""
+    return []
+
+
+@async_ttl_cache(ttl=60, maxsize=256, tables=CLIENT_CONTEXT_TABLES)
+async def build_candidate_universe(
+    client_id: int,
+    max_candidates: int = 120,
+    avoid: Optional[Tuple[str, ...]] = None,
+) -> List[Dict[str, Any]]:
     """
     Build a reasonable candidate set from src_stocks using client signals:
       - hinted tickers (ana_call_position_hints)
@@ -1978,246 +2677,189 @@ async def build_candidate_universe(client_id: int, max_candidates: int = 120) ->
       - portfolio top_sector/top_theme (int_client_portfolio_summary)
       - plus diversifiers (other sectors)
       - COMPLIANCE FILTERING: removes stocks from restricted sectors/volatility
+    Pass `avoid` (e.g. ctx["constraints"]["avoid_tickers"]) to skip re-fetching
+    positions/trades when the caller already has them.
     Returns list of stock rows from src_stocks.
     """
-    prof = await get_client_profile(client_id)
-    psum = await get_client_portfolio_summary(client_id)
-
-    # Get compliance restrictions for this client
-    compliance_restrictions = await get_client_compliance_restrictions(client_id)
+    # Client signals + compliance restrictions (independent, fetched concurrently)
+    prof, psum, compliance_restrictions, avoid_list, hinted, reads, calls = await asyncio.gather(
+        get_client_profile(client_id),
+        get_client_portfolio_summary(client_id),
+        get_client_compliance_restrictions(client_id),
+        build_avoid_tickers(client_id) if avoid is None else _no_rows(),
+        get_call_position_hints(client_id, limit=30),
+        get_recent_reads_daysdiff(client_id, limit=20),
+        get_recent_calls(client_id, limit=12),
+    )
 
     top_sector = (psum.get("top_sector") or "").strip()
     top_theme = (psum.get("top_theme") or "").strip()
     dom_theme = (prof.get("dominant_theme") or "").strip()
 
-    avoid = set(await build_avoid_tickers(client_id))
-
-    hinted = await get_call_position_hints(client_id, limit=30)
-    hinted_tickers = [h.get("ticker") for h in hinted if h.get("ticker")]
-    hinted_tickers = [t for t in hinted_tickers if t not in avoid]
-
-    reads = await get_recent_reads_daysdiff(client_id, limit=20)
-    read_tickers = [r.get("report_ticker") for r in reads if r.get("report_ticker")]
-    read_tickers = [t for t in read_tickers if t not in avoid]
-
-    calls = await get_recent_calls(client_id, limit=12)
-    call_tickers = []
-    call_stock_ids = []
-    for c in calls:
-        if c.get("stock_ticker"):
-            call_tickers.append(c["stock_ticker"])
-        if c.get("stock_id"):
-            call_stock_ids.append(int(c["stock_id"]))
-    call_tickers = [t for t in call_tickers if t and t not in avoid]
-
-    # 1) Direct ticker picks
-    ticker_pool = []
-    for t in hinted_tickers[:25] + read_tickers[:25] + call_tickers[:25]:
-        if t and t not in ticker_pool:
-            ticker_pool.append(t)
-
-    stocks_by_ticker: List[Dict[str, Any]] = []
+    avoid = frozenset(avoid_list if avoid is None else avoid)
+
+    def _usable(rows: List[Dict[str, Any]], key: str):
+        # first 25 non-avoided tickers of one signal source
+        return islice((r[key] for r in rows if r.get(key) and r[key] not in avoid), 25)
+
+    # 1) Direct ticker picks (order-preserving dedupe, one pass)
+    ticker_pool = list(dict.fromkeys(chain(
+        _usable(hinted, "ticker"),
+        _usable(reads, "report_ticker"),
+        _usable(calls, "stock_ticker"),
+    )))
+    call_stock_ids = [int(c["stock_id"]) for c in calls if c.get("stock_id")]
+
+    # The candidate sources are fetched in one UNION ALL round trip; each arm
+    # is tagged with `src` and wrapped so it can keep its own LIMIT.
+    arms: List[str] = []
+    params: Dict[str, Any] = {}
+
+    # 1+2) Direct ticker picks and stock IDs from calls share one arm; rows
+    # are split back into the two groups by ticker after the fetch
+    unique_ids = list(dict.fromkeys(call_stock_ids))
+
+    # avoid tickers are filtered in SQL so the per-arm LIMIT only counts rows
+    # that can actually be used. Arms overlap and compliance filtering drops
+    # more rows later, so each arm keeps headroom above max_candidates.
+    not_avoided = ""
+    if avoid:
+        placeholders, bound = _inlist("a", avoid)
+        params.update(bound)
+        not_avoided = f"AND ticker NOT IN ({placeholders})"
+    params["k"] = max(max_candidates, CANDIDATE_ARM_LIMIT)
+
+    direct = []
     if ticker_pool:
-        placeholders = ",".join([":t" + str(i) for i in range(len(ticker_pool))])
-        params = {"t" + str(i): ticker_pool[i] for i in range(len(ticker_pool))}
-        stocks_by_ticker = await fetch_all(
-            f"""
-            SELECT
-                stock_id,
-                company_name,
-                ticker,
-                sector,
-                region,
-                market_cap_bucket,
-                theme_tag,
-                volatility,
-                dividend_yield,
-                beta,
-                created_at
-            FROM src_stocks
-            WHERE ticker IN ({placeholders})
-            """,
-            params,
-        )
-
-    # 2) Stock IDs from calls
-    stocks_by_id: List[Dict[str, Any]] = []
-    if call_stock_ids:
-        unique_ids = []
-        for sid in call_stock_ids:
-            if sid not in unique_ids:
-                unique_ids.append(sid)
-
-        placeholders = ",".join([":id" + str(i) for i in range(len(unique_ids))])
-        params = {"id" + str(i): int(unique_ids[i]) for i in range(len(unique_ids))}
-        stocks_by_id = await fetch_all(
-            f"""
-            SELECT
-                stock_id,
-                company_name,
-                ticker,
-                sector,
-                region,
-                market_cap_bucket,
-                theme_tag,
-                volatility,
-                dividend_yield,
-                beta,
-                created_at
+        placeholders, bound = _inlist("t", ticker_pool)
+        params.update(bound)
+        direct.append(f"ticker IN ({placeholders})")
+    if unique_ids:
+        placeholders, bound = _inlist("id", unique_ids)
+        params.update(bound)
+        direct.append(f"stock_id IN ({placeholders})")
+    if direct:
+        arms.append(f"""
+            SELECT {CANDIDATE_COLUMNS}, 'direct' AS src
             FROM src_stocks
-            WHERE stock_id IN ({placeholders})
-            """,
-            params,
-        )
+            WHERE ({" OR ".join(direct)}) {not_avoided}
+        """)
 
     # 3) Sector/theme focused
-    sector_theme_stocks: List[Dict[str, Any]] = []
     conds = []
-    params: List[Any] = []
+    focus: List[Any] = []
     if top_sector:
-        conds.append(f"sector = :p{len(params)}")
-        params.append(top_sector)
+        conds.append(f"sector = :p{len(focus)}")
+        focus.append(top_sector)
     if top_theme:
-        conds.append(f"theme_tag = :p{len(params)}")
-        params.append(top_theme)
+        conds.append(f"theme_tag = :p{len(focus)}")
+        focus.append(top_theme)
     if dom_theme and dom_theme != top_theme:
-        conds.append(f"theme_tag = :p{len(params)}")
-        params.append(dom_theme)
+        conds.append(f"theme_tag = :p{len(focus)}")
+        focus.append(dom_theme)
 
     if conds:
         where = " OR ".join(conds)
-        sector_theme_stocks = await fetch_all(
-            f"""
-            SELECT
-                stock_id,
-                company_name,
-                ticker,
-                sector,
-                region,
-                market_cap_bucket,
-                theme_tag,
-                volatility,
-                dividend_yield,
-                beta,
-                created_at
-            FROM src_stocks
-            WHERE ({where})
-            LIMIT 120
-            """,
-            {f"p{i}": params[i] for i in range(len(params))},
-        )
+        params.update({f"p{i}": v for i, v in enumerate(focus)})
+        arms.append(f"""
+            SELECT * FROM (
+                SELECT {CANDIDATE_COLUMNS}, 'sector_theme' AS src
+                FROM src_stocks
+                WHERE ({where}) {not_avoided}
+                LIMIT :k
+            ) st
+        """)
 
     # 4) Diversifiers: pick from other sectors
-    diversifiers: List[Dict[str, Any]] = []
     if top_sector:
-        diversifiers = await fetch_all(
-            """
-            SELECT
-                stock_id,
-                company_name,
-                ticker,
-                sector,
-                region,
-                market_cap_bucket,
-                theme_tag,
-                volatility,
-                dividend_yield,
-                beta,
-                created_at
-            FROM src_stocks
-            WHERE sector != :top_sector
-            LIMIT 120
-            """,
-            {"top_sector": top_sector},
-        )
+        params["top_sector"] = top_sector
+        arms.append(f"""
+            SELECT * FROM (
+                SELECT {CANDIDATE_COLUMNS}, 'diversifier' AS src
+                FROM src_stocks
+                WHERE sector != :top_sector {not_avoided}
+                LIMIT :k
+            ) dv
+        """)
     else:
-        diversifiers = await fetch_all(
-            """
-            SELECT
-                stock_id,
-                company_name,
-                ticker,
-                sector,
-                region,
-                market_cap_bucket,
-                theme_tag,
-                volatility,
-                dividend_yield,
-                beta,
-                created_at
-            FROM src_stocks
-            LIMIT 120
-            """
-        )
+        arms.append(f"""
+            SELECT * FROM (
+                SELECT {CANDIDATE_COLUMNS}, 'diversifier' AS src
+                FROM src_stocks
+                WHERE 1 = 1 {not_avoided}
+                LIMIT :k
+            ) dv
+        """)
 
-    # merge unique by stock_id, remove avoid tickers
+    groups: Dict[str, List[Dict[str, Any]]] = {
+        "by_ticker": [], "by_id": [], "sector_theme": [], "diversifier": [],
+    }
+    ticker_set = frozenset(ticker_pool)
+    for row in await fetch_all(" UNION ALL ".join(arms), params):
+        src = row.pop("src")
+        if src == "direct":
+            src = "by_ticker" if row.get("ticker") in ticker_set else "by_id"
+        groups[src].append(row)
+    # Keep the order the separate ticker / stock_id index lookups returned
+    groups["by_ticker"].sort(key=lambda r: r["ticker"])
+    groups["by_id"].sort(key=lambda r: r["stock_id"])
+
+    # merge unique by stock_id
     merged: Dict[int, Dict[str, Any]] = {}
-    for group in (stocks_by_ticker, stocks_by_id, sector_theme_stocks, diversifiers):
+    for group in groups.values():
         for s in group:
-            sid = int(s["stock_id"])
-            if s.get("ticker") in avoid:
-                continue
-            merged[sid] = s
-
-    # Apply compliance filtering (restricted sectors, volatility limits)
-    all_stocks = list(merged.values())
-    compliant_stocks = await filter_stocks_by_compliance(all_stocks, compliance_restrictions)
+            merged[int(s["stock_id"])] = s
 
-    # trim
-    out = compliant_stocks[:max_candidates]
-    return out
+    # Apply compliance filtering (restricted sectors, volatility limits) and
+    # trim, stopping once max_candidates rows have passed
+    return list(islice(_iter_compliant(merged.values(), compliance_restrictions), max_candidates))
 
+@async_ttl_cache(ttl=60, maxsize=256, tables=CLIENT_CONTEXT_TABLES)
 async def build_client_context(client_id: int) -> Dict[str, Any]:
-    client = await get_client_header(client_id)
-    profile = await get_client_profile(client_id)
-    portfolio_summary = await get_client_portfolio_summary(client_id)
-    availability = await get_client_availability(client_id)
-
-    top_positions = await get_top_positions(client_id, limit=15)
-    recent_trades = await get_recent_trades(client_id, limit=15)
-    recent_calls = await get_recent_calls(client_id, limit=10)
-
-    reads_daysdiff = await get_recent_reads_daysdiff(client_id, limit=12)
-    readership_summary = await get_readership_summary(client_id)
-
-    call_hints = await get_call_position_hints(client_id, limit=20)
-    topic_signals = await get_topic_signals(client_id)
-    trade_summary = await get_trade_summary(client_id)
-    call_patterns = await get_call_patterns(client_id)
-
-    avoid_tickers = await build_avoid_tickers(client_id)
+    # Independent fetches run concurrently; single-row sections (header +
+    # analytics views) come back together in one bundle query
+    (
+        bundle,
+        top_positions,
+        recent_trades,
+        recent_calls,
+        reads_daysdiff,
+        call_hints,
+    ) = await asyncio.gather(
+        get_client_bundle(client_id),
+        get_top_positions(client_id, limit=15),
+        get_recent_trades(client_id, limit=15),
+        get_recent_calls(client_id, limit=10),
+        get_recent_reads_daysdiff(client_id, limit=12),
+        get_call_position_hints(client_id, limit=20),
+    )
 
-    # ENHANCED ANALYTICS (new)
-    portfolio_risk = await get_portfolio_risk(client_id)
-    engagement_momentum = await get_engagement_momentum(client_id)
-    conviction = await get_conviction(client_id)
-    readership_intel = await get_readership_intelligence(client_id)
-    enhanced_risk = await get_enhanced_risk(client_id)
+    avoid_tickers = _avoid_from(top_positions, recent_trades)
 
     return {
-        "client": client,
-        "profile": profile,
-        "portfolio_summary": portfolio_summary,
-        "availability": availability,
+        "client": bundle["header"],
+        "profile": bundle["profile"],
+        "portfolio_summary": bundle["portfolio_summary"],
+        "availability": bundle["availability"],
         "signals": {
             "recent_calls": recent_calls,
             "recent_trades": recent_trades,
             "recent_reads_daysdiff": reads_daysdiff,
-            "readership_summary": readership_summary,
+            "readership_summary": bundle["readership_summary"],
             "call_position_hints": call_hints,
-            "topic_signals": topic_signals,
-            "trade_summary": trade_summary,
-            "call_patterns": call_patterns,
+            "topic_signals": bundle["topic_signals"],
+            "trade_summary": bundle["trade_summary"],
+            "call_patterns": bundle["call_patterns"],
         },
         "holdings": {"top_positions": top_positions},
         "constraints": {"avoid_tickers": avoid_tickers},
         # NEW: Enhanced analytics
         "enhanced": {
-            "portfolio_risk": portfolio_risk,
-            "engagement_momentum": engagement_momentum,
-            "conviction": conviction,
-            "readership_intelligence": readership_intel,
-            "risk_assessment": enhanced_risk,
+            "portfolio_risk": bundle["portfolio_risk"],
+            "engagement_momentum": bundle["engagement_momentum"],
+            "conviction": bundle["conviction"],
+            "readership_intelligence": bundle["readership_intelligence"],
+            "risk_assessment": bundle["enhanced_risk"],
         },
     }
 
@@ -2226,50 +2868,124 @@ async def build_client_context(client_id: int) -> Dict[str, Any]:
 # OpenAI calls
 # =========================
 
-def llm_text(prompt: str) -> str:
+def _llm_cache_key(kind: str, prompt: str) -> str:
+    """SHA-256 over model, reply kind and prompt; shared by memory and DB cache."""
+    return hashlib.sha256(f"{OPENAI_MODEL}\n{kind}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+async def _load_llm_response(key: str) -> Optional[str]:
+    """Stored reply for `key` if younger than LLM_STORE_TTL, else None."""
+    cutoff = (datetime.utcnow() - timedelta(seconds=LLM_STORE_TTL)).strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        row = await fetch_one(
+            "SELECT response_text FROM llm_cache WHERE prompt_sha256 = :h AND created_at >= :cutoff",
+            {"h": key, "cutoff": cutoff},
+        )
+    except Exception as e:
+        logger.warning(f"llm_cache lookup failed: {e}")
+        return None
+    return row["response_text"] if row else None
+
+
+async def _store_llm_response(key: str, text: str) -> None:
+    try:
+        await execute_write(
+            """
+            INSERT INTO llm_cache (prompt_sha256, model, response_text, created_at)
+            VALUES (:h, :model, :txt, :ts)
+            ON CONFLICT (prompt_sha256) DO UPDATE SET
+                model = excluded.model,
+                response_text = excluded.response_text,
+                created_at = excluded.created_at
+            """,
+            {
+                "h": key,
+                "model": OPENAI_MODEL,
+                "txt": text,
+                "ts": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+    except Exception as e:
+        logger.warning(f"llm_cache store failed: {e}")
+
+
+async def llm_text(prompt: str, json_mode: bool = False) -> str:
     """Return plain text from the LLM.
 
     We intentionally use Chat Completions here for maximum compatibility with
     older `openai` Python SDK versions that do not support `oa.responses.*`.
+    With `json_mode=True` the model is constrained to emit a single JSON object.
     """
+    # JSON replies are cached by llm_json once they parse
+    key = None if json_mode else _llm_cache_key("text", prompt)
+    if key is not None:
+        cached = llm_cache.get(key)
+        if cached is None:
+            cached = await _load_llm_response(key)
+            if cached is not None:
+                llm_cache.set(key, cached, LLM_CACHE_TTL)
+        if cached is not None:
+            return cached
+
     if oa is None:
         raise RuntimeError("OPENAI_API_KEY is missing. Put it in .env or export it in your shell.")
 
-    resp = oa.chat.completions.create(
+    kwargs: Dict[str, Any] = {}
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+
+    resp = await oa.chat.completions.create(
         model=OPENAI_MODEL,
         messages=[
             {"role": "system", "content": "You are a helpful assistant. Follow instructions precisely."},
             {"role": "user", "content": prompt},
         ],
+        **kwargs,
     )
 
     txt = (resp.choices[0].message.content or "").strip()
+    if key is not None and txt:
+        llm_cache.set(key, txt, LLM_CACHE_TTL)
+        await _store_llm_response(key, txt)
     return txt
 
-def llm_json(prompt: str) -> Dict[str, Any]:
+async def llm_json(prompt: str) -> Dict[str, Any]:
     """
-    Best-effort JSON-only response. If the model returns text around JSON,
-    we try to extract the first {...} block.
+    JSON-only response. The model runs in JSON mode, so the direct parse is the
+    normal path; extracting the first {...} block is kept as a safety net.
+    The parsed object is cached, so callers must treat it as read-only.
     """
-    txt = llm_text(prompt)
+    key = _llm_cache_key("json", prompt)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Only JSON that parsed is ever stored, so a stored reply loads directly
+    stored = await _load_llm_response(key)
+    if stored is not None:
+        data = orjson.loads(stored)
+        llm_cache.set(key, data, LLM_CACHE_TTL)
+        return data
+
+    txt = await llm_text(prompt, json_mode=True)
     if not txt:
         raise ValueError("LLM returned empty output.")
 
-    # direct parse first
-    try:
-        return json.loads(txt)
-    except Exception:
-        pass
-
-    # try to extract JSON object
+    # direct parse first, then try to extract the JSON object
+    candidates = [txt]
     start = txt.find("{")
     end = txt.rfind("}")
     if start != -1 and end != -1 and end > start:
-        snippet = txt[start:end + 1]
+        candidates.append(txt[start:end + 1])
+
+    for raw in candidates:
         try:
-            return json.loads(snippet)
-        except Exception:
-            pass
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            continue
+        llm_cache.set(key, data, LLM_CACHE_TTL)
+        await _store_llm_response(key, raw)
+        return data
 
     raise ValueError("LLM did not return valid JSON.")
 
@@ -2296,53 +3012,83 @@ class StoryForStockRequest(BaseModel):
 # Prompt builders (DB-only, no hallucinated fields)
 # =========================
 
-def prompt_for_shortlist(
-    client_ctx: Dict[str, Any],
-    candidates: List[Dict[str, Any]],
-    candidates_market: Dict[int, Dict[str, Any]],
-    instruction: str,
-    max_words: int,
-) -> str:
-    """
-    We ask for strict JSON output to drive the UI cards.
-    """
-    avoid = client_ctx.get("constraints", {}).get("avoid_tickers", []) or []
+# Fields the prompts actually use. Internal row ids and aggregates that
+# duplicate another section are left out so fewer tokens are sent.
+CTX_ROW_FIELDS = {
+    "recent_calls": (
+        "call_timestamp", "direction", "duration_minutes", "discussed_company",
+        "discussed_sector", "stock_ticker", "stock_theme_tag", "notes_raw",
+    ),
+    "recent_trades": (
+        "trade_timestamp", "instrument_name", "ticker", "sector", "theme_tag",
+        "side", "notional_bucket",
+    ),
+    "recent_reads_daysdiff": (
+        "report_type", "report_sector", "report_company", "report_ticker",
+        "report_title", "read_timestamp", "days_diff",
+    ),
+    "call_position_hints": (
+        "ticker", "mention_count", "holding_hints", "add_hints", "reduce_hints",
+        "diversification_hints", "risk_mgmt_hints", "last_mention_ts",
+    ),
+    "top_positions": (
+        "ticker", "company_name", "sector", "theme_tag", "market_value", "weight", "currency",
+    ),
+}
 
-    # Compact candidate payload
-    cand_payload = []
-    for s in candidates:
-        sid = int(s["stock_id"])
-        m = candidates_market.get(sid, {})
-        cand_payload.append(
-            {
-                "stock_id": sid,
-                "ticker": s.get("ticker"),
-                "company_name": s.get("company_name"),
-                "sector": s.get("sector"),
-                "theme_tag": s.get("theme_tag"),
-                "region": s.get("region"),
-                "market_cap_bucket": s.get("market_cap_bucket"),
-                "last_close": m.get("last_close"),
-                "price_currency": m.get("price_currency"),
-                "price_date": m.get("price_date"),
-                "vol_20d": m.get("vol_20d"),
-                "vol_60d": m.get("vol_60d"),
-                "vol_date": m.get("vol_date"),
-            }
-        )
+SHORTLIST_CTX_FIELDS = {
+    "client": ("client_name", "firm_name", "client_type", "region"),
+    "profile": (
+        "risk_appetite", "investment_style", "engagement_level",
+        "dominant_topic", "dominant_theme",
+    ),
+    "portfolio_summary": (
+        "trade_count", "top_sector", "top_sector_share", "top_theme", "top_theme_share",
+        "buy_rate", "concentration_flag", "direction_flag", "activity_flag",
+    ),
+}
 
-    minimal_ctx = {
-        "client": client_ctx.get("client", {}),
-        "profile": client_ctx.get("profile", {}),
-        "portfolio_summary": client_ctx.get("portfolio_summary", {}),
-        "availability": client_ctx.get("availability", {}),
-        "signals": client_ctx.get("signals", {}),
-        "holdings": client_ctx.get("holdings", {}),
-        "constraints": client_ctx.get("constraints", {}),
-        "candidates": cand_payload,
-    }
+# trade_summary / call_patterns repeat portfolio_summary / availability
+PROMPT_SIGNALS = (
+    "recent_calls", "recent_trades", "recent_reads_daysdiff",
+    "call_position_hints", "readership_summary", "topic_signals",
+)
+
+SHORTLIST_NOTES_CHARS = 200
+
+
+def _pick(d: Optional[Dict[str, Any]], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    d = d or {}
+    return {k: d[k] for k in fields if k in d}
+
+
+def _trim_signals(
+    signals: Dict[str, Any],
+    keys: Tuple[str, ...],
+    notes_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for key in keys:
+        value = signals.get(key)
+        fields = CTX_ROW_FIELDS.get(key)
+        if fields and isinstance(value, list):
+            value = [_pick(r, fields) for r in value]
+        out[key] = value
+    if notes_chars:
+        for call in out.get("recent_calls") or []:
+            notes = call.get("notes_raw")
+            if notes and len(notes) > notes_chars:
+                call["notes_raw"] = notes[:notes_chars]
+    return out
 
-    return f"""
+
+def _trim_holdings(holdings: Dict[str, Any]) -> Dict[str, Any]:
+    positions = (holdings or {}).get("top_positions") or []
+    return {"top_positions": [_pick(p, CTX_ROW_FIELDS["top_positions"]) for p in positions]}
+
+
+# Static prompt text is built once; only the slots are filled per request.
+SHORTLIST_PROMPT_TEMPLATE = """
 You are an AI equity sales assistant supporting a sell-side analyst.
 
 CRITICAL DATA RULES
@@ -2403,101 +3149,65 @@ ANALYST INSTRUCTION:
 {instruction}
 
 JSON INPUT:
-{json.dumps(minimal_ctx, ensure_ascii=False)}
+{payload}
 
 Max length guidance: ~{max_words} words worth of JSON strings.
 """.strip()
 
-def prompt_for_story(
+
+def prompt_for_shortlist(
     client_ctx: Dict[str, Any],
-    selected_stock: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    candidates_market: Dict[int, Dict[str, Any]],
     instruction: str,
-    mode: str,
     max_words: int,
-    call_summary: Optional[Dict[str, Any]] = None,
-    objection_section: Optional[str] = None,
-    fundamentals_block: Optional[str] = None,
 ) -> str:
-    mode = (mode or "FULL").upper()
-    if mode not in ("FULL", "BULLETS"):
-        mode = "FULL"
-
-    # Extract client profile for risk matching logic
-    profile = client_ctx.get("profile", {})
-    enhanced = client_ctx.get("enhanced", {})
-    risk_assessment = enhanced.get("risk_assessment", {})
-    portfolio_summary = client_ctx.get("portfolio_summary", {})
-
-    # Determine client risk profile
-    client_type = client_ctx.get("client", {}).get("client_type", "")
-    risk_appetite = profile.get("risk_appetite", "Moderate")
-    investment_style = profile.get("investment_style", "Fundamental")
-
-    # Build risk matching guidance
-    risk_guidance = ""
-    if "Hedge" in client_type or risk_appetite in ["High", "Aggressive"]:
-        risk_guidance = """
-RISK PROFILE MATCH: This is a HIGH-RISK client (Hedge Fund / Aggressive).
-- Prioritize stocks with higher volatility and upside potential
-- Emphasize alpha generation, momentum plays, and asymmetric risk/reward
-- If recommending a defensive stock, explicitly justify why (portfolio balance, hedging)
-"""
-    elif "Pension" in client_type or "Insurance" in client_type or risk_appetite in ["Low", "Conservative"]:
-        risk_guidance = """
-RISK PROFILE MATCH: This is a LOW-RISK client (Pension/Insurance / Conservative).
-- Prioritize stable, dividend-paying, low-volatility stocks
-- Emphasize capital preservation, steady income, quality metrics
-- If recommending a higher-risk stock, justify the risk-adjusted return
-"""
-    else:
-        risk_guidance = """
-RISK PROFILE MATCH: This is a MODERATE-RISK client.
-- Balance growth potential with risk management
-- Consider both upside opportunity and downside protection
-"""
-
-    # For story, we pass a small structured pack (no giant universe)
-    pack = {
-        "client": client_ctx.get("client", {}),
-        "profile": client_ctx.get("profile", {}),
-        "portfolio_summary": client_ctx.get("portfolio_summary", {}),
-        "availability": client_ctx.get("availability", {}),
-        "signals": client_ctx.get("signals", {}),
-        "holdings": client_ctx.get("holdings", {}),
-        "constraints": client_ctx.get("constraints", {}),
-        "enhanced": client_ctx.get("enhanced", {}),
-        "selected_stock": selected_stock,
-    }
-
-    # Add pre-summarized call context if available
-    if call_summary:
-        pack["call_summary"] = call_summary
-
-    # Build objection section
-    objection_block = ""
-    if objection_section:
-        objection_block = f"""
-{objection_section}
+    """
+    We ask for strict JSON output to drive the UI cards.
+    """
+    avoid = client_ctx.get("constraints", {}).get("avoid_tickers", []) or []
 
-IMPORTANT: Address likely objections proactively in your story. Include a dedicated section:
-"POTENTIAL OBJECTIONS & BEST ANSWERS" with 2-3 anticipated client pushbacks and how to handle them.
-"""
+    # Compact candidate payload
+    cand_payload = []
+    for s in candidates:
+        sid = int(s["stock_id"])
+        m = candidates_market.get(sid, {})
+        cand_payload.append(
+            {
+                "stock_id": sid,
+                "ticker": s.get("ticker"),
+                "company_name": s.get("company_name"),
+                "sector": s.get("sector"),
+                "theme_tag": s.get("theme_tag"),
+                "region": s.get("region"),
+                "market_cap_bucket": s.get("market_cap_bucket"),
+                "last_close": m.get("last_close"),
+                "price_currency": m.get("price_currency"),
+                "vol_20d": m.get("vol_20d"),
+                "vol_60d": m.get("vol_60d"),
+            }
+        )
 
-    # Build fundamentals section
-    fundamentals_section = ""
-    if fundamentals_block:
-        fundamentals_section = f"""
-{fundamentals_block}
+    # Only what the rules below reference; enhanced analytics and
+    # availability are story-only
+    minimal_ctx = {
+        **{k: _pick(client_ctx.get(k), fields) for k, fields in SHORTLIST_CTX_FIELDS.items()},
+        "signals": _trim_signals(
+            client_ctx.get("signals", {}), PROMPT_SIGNALS, notes_chars=SHORTLIST_NOTES_CHARS
+        ),
+        "holdings": _trim_holdings(client_ctx.get("holdings", {})),
+        "constraints": client_ctx.get("constraints", {}),
+        "candidates": cand_payload,
+    }
 
-CRITICAL: Use these REAL fundamentals in your story! Reference specific metrics:
-- Use valuation (P/E, EV/EBITDA) to justify or challenge current price
-- Cite profitability (ROE, margins) to demonstrate quality
-- Reference growth rates to support momentum thesis
-- Mention analyst ratings and price targets for credibility
-- Use dividend yield for income-focused clients
-"""
+    return SHORTLIST_PROMPT_TEMPLATE.format(
+        instruction=instruction,
+        payload=orjson.dumps(minimal_ctx).decode(),
+        max_words=max_words,
+    )
 
-    return f"""
+
+STORY_PROMPT_TEMPLATE = """
 You are an elite equity sales storyteller at ODDO BHF. Your job is to craft compelling,
 personalized investment narratives that connect research insights to client needs.
 
@@ -2585,12 +3295,131 @@ Mode BULLETS: 8-10 punchy bullet points for quick call prep
 - No generic statements - everything must be specific to THIS client
 
 MODE: {mode}
-ANALYST INSTRUCTION: {instruction if instruction else "None - use default storytelling framework"}
+ANALYST INSTRUCTION: {instruction}
 
 === CLIENT DATA ===
-{json.dumps(pack, ensure_ascii=False, indent=2)}
+{payload}
 """.strip()
 
+STORY_OBJECTION_TEMPLATE = """
+{objection_section}
+
+IMPORTANT: Address likely objections proactively in your story. Include a dedicated section:
+"POTENTIAL OBJECTIONS & BEST ANSWERS" with 2-3 anticipated client pushbacks and how to handle them.
+"""
+
+STORY_FUNDAMENTALS_TEMPLATE = """
+{fundamentals_block}
+
+CRITICAL: Use these REAL fundamentals in your story! Reference specific metrics:
+- Use valuation (P/E, EV/EBITDA) to justify or challenge current price
+- Cite profitability (ROE, margins) to demonstrate quality
+- Reference growth rates to support momentum thesis
+- Mention analyst ratings and price targets for credibility
+- Use dividend yield for income-focused clients
+"""
+
+HIGH_RISK_GUIDANCE = """
+RISK PROFILE MATCH: This is a HIGH-RISK client (Hedge Fund / Aggressive).
+- Prioritize stocks with higher volatility and upside potential
+- Emphasize alpha generation, momentum plays, and asymmetric risk/reward
+- If recommending a defensive stock, explicitly justify why (portfolio balance, hedging)
+"""
+
+LOW_RISK_GUIDANCE = """
+RISK PROFILE MATCH: This is a LOW-RISK client (Pension/Insurance / Conservative).
+- Prioritize stable, dividend-paying, low-volatility stocks
+- Emphasize capital preservation, steady income, quality metrics
+- If recommending a higher-risk stock, justify the risk-adjusted return
+"""
+
+MOD_RISK_GUIDANCE = """
+RISK PROFILE MATCH: This is a MODERATE-RISK client.
+- Balance growth potential with risk management
+- Consider both upside opportunity and downside protection
+"""
+
+RISK_GUIDANCE = {
+    "high": HIGH_RISK_GUIDANCE,
+    "low": LOW_RISK_GUIDANCE,
+    "moderate": MOD_RISK_GUIDANCE,
+}
+
+
+def _risk_bucket(client_type: str, risk_appetite: str) -> str:
+    """Classify a client as "high", "low" or "moderate" risk for the story prompt."""
+    if "Hedge" in client_type or risk_appetite in ("High", "Aggressive"):
+        return "high"
+    if "Pension" in client_type or "Insurance" in client_type or risk_appetite in ("Low", "Conservative"):
+        return "low"
+    return "moderate"
+
+
+def prompt_for_story(
+    client_ctx: Dict[str, Any],
+    selected_stock: Dict[str, Any],
+    instruction: str,
+    mode: str,
+    max_words: int,
+    call_summary: Optional[Dict[str, Any]] = None,
+    objection_section: Optional[str] = None,
+    fundamentals_block: Optional[str] = None,
+) -> str:
+    mode = (mode or "FULL").upper()
+    if mode not in ("FULL", "BULLETS"):
+        mode = "FULL"
+
+    # Extract client profile for risk matching logic
+    profile = client_ctx.get("profile", {})
+    enhanced = client_ctx.get("enhanced", {})
+    risk_assessment = enhanced.get("risk_assessment", {})
+    portfolio_summary = client_ctx.get("portfolio_summary", {})
+
+    # Determine client risk profile
+    client_type = client_ctx.get("client", {}).get("client_type", "")
+    risk_appetite = profile.get("risk_appetite", "Moderate")
+    investment_style = profile.get("investment_style", "Fundamental")
+
+    # Build risk matching guidance
+    risk_guidance = RISK_GUIDANCE[_risk_bucket(client_type, risk_appetite)]
+
+    # For story, we pass a small structured pack (no giant universe)
+    pack = {
+        "client": client_ctx.get("client", {}),
+        "profile": client_ctx.get("profile", {}),
+        "portfolio_summary": client_ctx.get("portfolio_summary", {}),
+        "availability": client_ctx.get("availability", {}),
+        "signals": _trim_signals(client_ctx.get("signals", {}), PROMPT_SIGNALS),
+        "holdings": _trim_holdings(client_ctx.get("holdings", {})),
+        "constraints": client_ctx.get("constraints", {}),
+        "enhanced": client_ctx.get("enhanced", {}),
+        "selected_stock": selected_stock,
+    }
+
+    # Add pre-summarized call context if available
+    if call_summary:
+        pack["call_summary"] = call_summary
+
+    # Build objection section
+    objection_block = ""
+    if objection_section:
+        objection_block = STORY_OBJECTION_TEMPLATE.format(objection_section=objection_section)
+
+    # Build fundamentals section
+    fundamentals_section = ""
+    if fundamentals_block:
+        fundamentals_section = STORY_FUNDAMENTALS_TEMPLATE.format(fundamentals_block=fundamentals_block)
+
+    return STORY_PROMPT_TEMPLATE.format(
+        risk_guidance=risk_guidance,
+        fundamentals_section=fundamentals_section,
+        objection_block=objection_block,
+        mode=mode,
+        instruction=instruction or "None - use default storytelling framework",
+        payload=orjson.dumps(pack, option=orjson.OPT_INDENT_2).decode(),
+        max_words=max_words,
+    )
+
 
 # =========================
 # PDF export (Shortlist report)
@@ -2603,6 +3432,10 @@ def _require_pdf_deps() -> None:
         )
 
 
+# x position of every text line, in points (None when reportlab is missing)
+LEFT_MARGIN = 20 * mm if mm is not None else None
+
+
 def build_shortlist_pdf_bytes(client_ctx: Dict[str, Any], shortlist_payload: Dict[str, Any]) -> bytes:
     """Build a simple A4 PDF with client essentials + shortlist. Returns raw PDF bytes."""
     _require_pdf_deps()
@@ -2611,16 +3444,23 @@ def build_shortlist_pdf_bytes(client_ctx: Dict[str, Any], shortlist_payload: Dic
     c = canvas.Canvas(buf, pagesize=A4)
     W, H = A4
 
+    # Font size currently set on the canvas; setFont is only re-emitted
+    # into the PDF stream when it changes
+    current_size = [None]
+
     def _line(y: float, text: str, size: int = 11) -> float:
         # Avoid crashes on None / non-string values
         safe = str(text) if text is not None else ""
-        c.setFont("Helvetica", size)
-        c.drawString(20 * mm, y, safe)
+        if size != current_size[0]:
+            c.setFont("Helvetica", size)
+            current_size[0] = size
+        c.drawString(LEFT_MARGIN, y, safe)
         return y
 
     def _new_page() -> float:
         c.showPage()
         c.setFont("Helvetica", 11)
+        current_size[0] = 11
         return H - 20 * mm
 
     y = H - 20 * mm
@@ -2689,33 +3529,72 @@ def build_shortlist_pdf_bytes(client_ctx: Dict[str, Any], shortlist_payload: Dic
     buf.seek(0)
     return buf.getvalue()
 
+
+# reportlab rendering is pure Python and holds the GIL, so PDFs are built in
+# worker processes; the pool is created at startup.
+PDF_WORKERS = max(1, int(os.environ.get("PDF_WORKERS", "2")))
+PDF_EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+
+def start_pdf_executor() -> None:
+    global PDF_EXECUTOR
+    # spawn, not fork: the parent already runs DB worker threads
+    PDF_EXECUTOR = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def stop_pdf_executor() -> None:
+    global PDF_EXECUTOR
+    if PDF_EXECUTOR is not None:
+        PDF_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        PDF_EXECUTOR = None
+
+
+async def build_shortlist_pdf_bytes_async(client_ctx: Dict[str, Any], shortlist_payload: Dict[str, Any]) -> bytes:
+    """Render the shortlist PDF off the event loop (worker process, or a thread before startup)."""
+    if PDF_EXECUTOR is None:
+        return await anyio.to_thread.run_sync(build_shortlist_pdf_bytes, client_ctx, shortlist_payload)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(PDF_EXECUTOR, build_shortlist_pdf_bytes, client_ctx, shortlist_payload)
+
 # =========================
 # API endpoints
 # =========================
 
-@app.get("/", response_class=HTMLResponse)
-def home():
-    index_path = os.path.join(FRONTEND_DIR, "index.html")
-    if os.path.isfile(index_path):
-        with open(index_path, "r", encoding="utf-8") as f:
-            return f.read()
-    return "<h3>Backend is running.</h3><p>Use /api/health or /api/search?q=...</p>"
+def _json_default(obj: Any) -> Any:
+    # Postgres NUMERIC columns come back as Decimal
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+def _json_response(body: Any) -> Response:
+    """JSON-encode `body` with orjson; returning a Response skips FastAPI's jsonable_encoder pass."""
+    return Response(
+        orjson.dumps(body, default=_json_default, option=orjson.OPT_NON_STR_KEYS),
+        media_type="application/json",
+    )
+
+
+HEALTH_TABLES = (
+    "src_clients", "src_stocks", "src_call_logs", "src_trade_executions",
+    "src_stock_prices", "src_stock_volatility",
+    "src_portfolio_snapshots", "src_positions",
+    "ana_readership_daysdiff", "int_client_profile", "int_client_portfolio_summary",
+)
+
 
 @app.get("/api/health")
 async def api_health():
     try:
-        for t in [
-            "src_clients", "src_stocks", "src_call_logs", "src_trade_executions",
-            "src_stock_prices", "src_stock_volatility",
-            "src_portfolio_snapshots", "src_positions",
-            "ana_readership_daysdiff", "int_client_profile", "int_client_portfolio_summary",
-        ]:
-            _ = await table_exists(t)
-
-        row = await fetch_one("SELECT COUNT(*) AS n FROM src_clients")
+        # One existence query for every table, alongside the client count
+        row, existing = await asyncio.gather(
+            fetch_one("SELECT COUNT(*) AS n FROM src_clients"),
+            tables_exist(HEALTH_TABLES),
+        )
         return {
             "ok": True,
             "clients": row["n"] if row else None,
+            "tables": {t: t in existing for t in HEALTH_TABLES},
             "database_url": DATABASE_URL,
             "db_path": DB_PATH,
             "model": OPENAI_MODEL,
@@ -2729,17 +3608,21 @@ async def api_health():
             "model": OPENAI_MODEL,
         }
 
+# Everything here is fixed at import time
+_ENV_PAYLOAD = {
+    "openai_key_present": bool(OPENAI_API_KEY),
+    "openai_model": OPENAI_MODEL,
+    "db_path": DB_PATH,
+    "database_url": DATABASE_URL,
+    "base_dir": BASE_DIR,
+    "env_path": ENV_PATH,
+    "cwd": os.getcwd(),
+}
+
+
 @app.get("/api/env")
 def api_env():
-    return {
-        "openai_key_present": bool(OPENAI_API_KEY),
-        "openai_model": OPENAI_MODEL,
-        "db_path": DB_PATH,
-        "database_url": DATABASE_URL,
-        "base_dir": BASE_DIR,
-        "env_path": ENV_PATH,
-        "cwd": os.getcwd(),
-    }
+    return _ENV_PAYLOAD
 
 
 @app.get("/api/analytics")
@@ -3054,6 +3937,42 @@ async def api_client(client_id: int):
     except Exception as e:
         return JSONResponse(status_code=200, content={"error": str(e)})
 
+
+# Pads why_bullets to exactly 3 entries
+UNKNOWN_BULLETS = ("unknown (insufficient evidence in provided signals)",) * 3
+
+
+def _clean_shortlist_item(item: Dict[str, Any], market: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Normalize one LLM shortlist item (don't invent values; default to None/unknown)."""
+    sid = item.get("stock_id")
+    try:
+        sid_int = int(sid) if sid is not None else None
+    except Exception:
+        sid_int = None
+
+    bucket = item.get("vol_bucket")
+    if bucket not in VOL_BUCKETS:
+        bucket = market.get(sid_int, {}).get("vol_bucket", "unknown")
+
+    why = item.get("why_bullets")
+    why = [str(x) for x in why[:3]] if isinstance(why, list) else []
+    why.extend(UNKNOWN_BULLETS[len(why):])
+
+    return {
+        "stock_id": sid_int,
+        "ticker": item.get("ticker"),
+        "company_name": item.get("company_name"),
+        "sector": item.get("sector"),
+        "theme_tag": item.get("theme_tag"),
+        "last_close": item.get("last_close"),
+        "price_currency": item.get("price_currency"),
+        "vol_20d": item.get("vol_20d"),
+        "vol_60d": item.get("vol_60d"),
+        "vol_bucket": bucket,
+        "why_bullets": why,
+    }
+
+
 @app.post("/api/shortlist")
 async def api_shortlist(req: ShortlistRequest):
     """
@@ -3066,129 +3985,99 @@ async def api_shortlist(req: ShortlistRequest):
       }
     """
     try:
-        if oa is None:
-            raise RuntimeError("OPENAI_API_KEY is missing or not loaded. Check /api/env and ensure .env is in the project folder next to server.py.")
-        ctx = await build_client_context(req.client_id)
-
-        instruction = (req.instruction or "").strip()
-        if not instruction:
-            instruction = "Rank 10 stocks that fit this client; prioritize personalization + diversification; use calls/reads (days_diff) as evidence."
-
-        candidates = await build_candidate_universe(req.client_id, max_candidates=req.max_candidates)
-
-        if not candidates:
-            raise ValueError("No candidates found in src_stocks for shortlist generation.")
-
-        stock_ids = [int(s["stock_id"]) for s in candidates]
-        market = await get_stock_market_fields(stock_ids)
-
-        # Build prompt
-        prompt = prompt_for_shortlist(
-            client_ctx=ctx,
-            candidates=candidates,
-            candidates_market=market,
-            instruction=instruction,
-            max_words=req.max_words,
-        )
-
-        # LLM JSON
-        data = llm_json(prompt)
+        payload, _ctx = await _generate_shortlist(req)
+        return _json_response(payload)
+    except Exception as e:
+        return JSONResponse(status_code=200, content={"error": str(e)})
 
-        shortlist = data.get("shortlist")
-        top_picks = data.get("top_picks")
-        notes = data.get("notes_for_analyst")
 
-        # Validate shortlist - be lenient (allow 5-15 items, take first 10)
-        if not isinstance(shortlist, list) or len(shortlist) < 5:
-            raise ValueError(f"LLM JSON invalid: shortlist must be a list with at least 5 items. Got: {type(shortlist)}")
-        shortlist = shortlist[:10]  # Take first 10 if more
+async def _generate_shortlist(req: ShortlistRequest) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build the /api/shortlist payload; also returns the client context it used (raises on failure)."""
+    if oa is None:
+        raise RuntimeError("OPENAI_API_KEY is missing or not loaded. Check /api/env and ensure .env is in the project folder next to server.py.")
+    instruction = (req.instruction or "").strip()
+    if not instruction:
+        instruction = "Rank 10 stocks that fit this client; prioritize personalization + diversification; use calls/reads (days_diff) as evidence."
+
+    # Context and candidates are independent; the candidate side derives
+    # the same avoid list from its own (concurrent) holdings/trades fetch
+    ctx, candidates = await asyncio.gather(
+        build_client_context(req.client_id),
+        build_candidate_universe(req.client_id, max_candidates=req.max_candidates),
+    )
 
-        # Validate top_picks - be lenient
-        if not isinstance(top_picks, list) or len(top_picks) < 1:
-            # Try to extract from shortlist
-            top_picks = [s.get("ticker", "N/A") for s in shortlist[:2] if isinstance(s, dict)]
-        top_picks = top_picks[:2]  # Take first 2
+    if not candidates:
+        raise ValueError("No candidates found in src_stocks for shortlist generation.")
 
-        # Post-process: ensure vol_bucket exists and is consistent with vol_60d
-        cleaned = []
-        for item in shortlist:
-            if not isinstance(item, dict):
-                continue
-            # Ensure required keys exist (don’t invent values; default to None/unknown)
-            sid = item.get("stock_id")
-            try:
-                sid_int = int(sid) if sid is not None else None
-            except Exception:
-                sid_int = None
-
-            v60 = item.get("vol_60d")
-            bucket = item.get("vol_bucket")
-            if bucket not in ("low", "medium", "high", "unknown"):
-                bucket = vol_bucket(v60)
-
-            why = item.get("why_bullets")
-            if not isinstance(why, list):
-                why = []
-            # Keep exactly 3 strings
-            why = [str(x) for x in why][:3]
-            while len(why) < 3:
-                why.append("unknown (insufficient evidence in provided signals)")
-
-            cleaned.append(
-                {
-                    "stock_id": sid_int,
-                    "ticker": item.get("ticker"),
-                    "company_name": item.get("company_name"),
-                    "sector": item.get("sector"),
-                    "theme_tag": item.get("theme_tag"),
-                    "last_close": item.get("last_close"),
-                    "price_currency": item.get("price_currency"),
-                    "vol_20d": item.get("vol_20d"),
-                    "vol_60d": item.get("vol_60d"),
-                    "vol_bucket": bucket,
-                    "why_bullets": why,
-                }
-            )
+    stock_ids = [int(s["stock_id"]) for s in candidates]
+    market = await get_stock_market_fields(stock_ids)
 
-        # Keep only 10
-        cleaned = cleaned[:10]
+    # Build prompt
+    prompt = prompt_for_shortlist(
+        client_ctx=ctx,
+        candidates=candidates,
+        candidates_market=market,
+        instruction=instruction,
+        max_words=req.max_words,
+    )
 
-        # Log to audit trail
-        shortlist_text = json.dumps(data, ensure_ascii=False, indent=2)
-        generation_id = await log_generation(
-            client_id=req.client_id,
-            generation_type="shortlist",
-            model_used=OPENAI_MODEL,
-            response_text=shortlist_text,
-            instruction=instruction,
-        )
+    # LLM JSON
+    data = await llm_json(prompt)
+
+    shortlist = data.get("shortlist")
+    top_picks = data.get("top_picks")
+    notes = data.get("notes_for_analyst")
+
+    # Validate shortlist - be lenient (allow 5-15 items, take first 10)
+    if not isinstance(shortlist, list) or len(shortlist) < 5:
+        raise ValueError(f"LLM JSON invalid: shortlist must be a list with at least 5 items. Got: {type(shortlist)}")
+    shortlist = shortlist[:10]  # Take first 10 if more
+
+    # Validate top_picks - be lenient
+    if not isinstance(top_picks, list) or len(top_picks) < 1:
+        # Try to extract from shortlist
+        top_picks = [s.get("ticker", "N/A") for s in shortlist[:2] if isinstance(s, dict)]
+    top_picks = top_picks[:2]  # Take first 2
+
+    # Post-process: ensure vol_bucket exists and is consistent with vol_60d
+    cleaned = [_clean_shortlist_item(item, market) for item in shortlist if isinstance(item, dict)]
+
+    # Log to audit trail
+    shortlist_text = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    generation_id = await log_generation(
+        client_id=req.client_id,
+        generation_type="shortlist",
+        model_used=OPENAI_MODEL,
+        response_text=shortlist_text,
+        instruction=instruction,
+    )
 
-        return {
-            "client_id": req.client_id,
-            "model": OPENAI_MODEL,
-            "shortlist": cleaned,
-            "top_picks": top_picks,
-            "notes_for_analyst": notes if isinstance(notes, list) else [],
-            "shortlist_text": shortlist_text,
-            "generation_id": generation_id,
-        }
+    payload = {
+        "client_id": req.client_id,
+        "model": OPENAI_MODEL,
+        "shortlist": cleaned,
+        "top_picks": top_picks,
+        "notes_for_analyst": notes if isinstance(notes, list) else [],
+        "shortlist_text": shortlist_text,
+        "generation_id": generation_id,
+    }
+    return payload, ctx
 
-    except Exception as e:
-        return JSONResponse(status_code=200, content={"error": str(e)})
 
 @app.post("/api/story_for_stock")
 async def api_story_for_stock(req: StoryForStockRequest):
     try:
         if oa is None:
             raise RuntimeError("OPENAI_API_KEY is missing or not loaded. Check /api/env and ensure .env is in the project folder next to server.py.")
-        ctx = await build_client_context(req.client_id)
-
         instruction = (req.instruction or "").strip()
         if not instruction:
             instruction = "Make it persuasive and client-specific. Use WHAT/WWHY and cite calls/reads/trades evidence."
 
         ticker = req.selected_ticker.strip()
-        stock = await get_stock_by_ticker(ticker)
+        ctx, stock = await asyncio.gather(
+            build_client_context(req.client_id),
+            get_stock_by_ticker(ticker),
+        )
         if not stock:
             raise ValueError(f"Ticker '{ticker}' not found in src_stocks.")
 
@@ -3202,7 +4091,7 @@ async def api_story_for_stock(req: StoryForStockRequest):
             "price_date": m.get("price_date"),
             "vol_20d": m.get("vol_20d"),
             "vol_60d": m.get("vol_60d"),
-            "vol_bucket": vol_bucket(m.get("vol_60d")),
+            "vol_bucket": m.get("vol_bucket", "unknown"),
             "vol_date": m.get("vol_date"),
         }
 
@@ -3226,7 +4115,7 @@ async def api_story_for_stock(req: StoryForStockRequest):
             fundamentals_block=fundamentals_block,
         )
 
-        story = llm_text(prompt)
+        story = await llm_text(prompt)
 
         # Log to audit trail
         generation_id = await log_generation(
@@ -3239,14 +4128,14 @@ async def api_story_for_stock(req: StoryForStockRequest):
             instruction=instruction,
         )
 
-        return {
+        return _json_response({
             "client_id": req.client_id,
             "model": OPENAI_MODEL,
             "selected_ticker": ticker,
             "mode": (req.mode or "FULL").upper(),
             "story": story,
             "generation_id": generation_id,
-        }
+        })
 
     except Exception as e:
         return JSONResponse(status_code=200, content={"error": str(e)})
@@ -3261,11 +4150,21 @@ async def api_history(client_id: int, limit: int = 50):
     """Get generation history for a client (for compliance/audit)."""
     try:
         history = await get_generation_history(client_id, limit=limit)
-        return {"client_id": client_id, "history": history}
+        return _json_response({"client_id": client_id, "history": history})
     except Exception as e:
         return JSONResponse(status_code=200, content={"error": str(e), "history": []})
 
 
+PDF_CHUNK_SIZE = 64 * 1024
+
+
+async def _iter_chunks(data: bytes, size: int = PDF_CHUNK_SIZE):
+    """Yield `data` in fixed-size slices without copying it."""
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
+
+
 # PDF endpoint for shortlist report
 @app.post("/api/shortlist.pdf")
 async def api_shortlist_pdf(req: ShortlistRequest):
@@ -3273,19 +4172,13 @@ async def api_shortlist_pdf(req: ShortlistRequest):
     try:
         _require_pdf_deps()
 
-        # Reuse the same shortlist generator to ensure the PDF matches the UI
-        payload = await api_shortlist(req)
-        if isinstance(payload, JSONResponse):
-            return payload
-        if isinstance(payload, dict) and payload.get("error"):
-            return JSONResponse(status_code=200, content=payload)
-
-        ctx = await build_client_context(req.client_id)
-        pdf_bytes = build_shortlist_pdf_bytes(ctx, payload)
+        # Reuse the same shortlist generator (and its client context) so the PDF matches the UI
+        payload, ctx = await _generate_shortlist(req)
+        pdf_bytes = await build_shortlist_pdf_bytes_async(ctx, payload)
 
         filename = f"shortlist_client_{req.client_id}.pdf"
         return StreamingResponse(
-            BytesIO(pdf_bytes),
+            _iter_chunks(pdf_bytes),
             media_type="application/pdf",
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
@@ -3297,6 +4190,39 @@ async def api_shortlist_pdf(req: ShortlistRequest):
 # Analyst Stock Override - Manual Selection
 # =========================
 
+STOCKS_AVAILABLE_SQL = """
+    SELECT DISTINCT
+        s.stock_id,
+        s.ticker,
+        s.company_name,
+        s.sector,
+        s.region,
+        s.market_cap_bucket,
+        s.theme_tag
+    FROM src_stocks s
+    WHERE (s.ticker LIKE :search OR s.company_name LIKE :search OR s.sector LIKE :search)
+    ORDER BY s.company_name
+    LIMIT :limit
+"""
+
+# Substring match through the trigram index instead of scanning src_stocks
+STOCKS_AVAILABLE_FTS_SQL = """
+    SELECT
+        s.stock_id,
+        s.ticker,
+        s.company_name,
+        s.sector,
+        s.region,
+        s.market_cap_bucket,
+        s.theme_tag
+    FROM src_stocks_fts f
+    JOIN src_stocks s ON s.stock_id = f.rowid
+    WHERE src_stocks_fts MATCH :q
+    ORDER BY s.company_name
+    LIMIT :limit
+"""
+
+
 @app.get("/api/stocks/available")
 async def api_available_stocks(search: str = "", limit: int = 100):
     """
@@ -3304,24 +4230,12 @@ async def api_available_stocks(search: str = "", limit: int = 100):
     Only returns stocks that are in the universe (have reports/coverage).
     """
     try:
-        search_term = f"%{search}%" if search else "%"
-        stocks = await fetch_all(
-            """
-            SELECT DISTINCT
-                s.stock_id,
-                s.ticker,
-                s.company_name,
-                s.sector,
-                s.region,
-                s.market_cap_bucket,
-                s.theme_tag
-            FROM src_stocks s
-            WHERE (s.ticker LIKE :search OR s.company_name LIKE :search OR s.sector LIKE :search)
-            ORDER BY s.company_name
-            LIMIT :limit
-            """,
-            {"search": search_term, "limit": limit},
-        )
+        if _stock_fts_ready and len(search) >= _FTS_MIN_TERM_LEN:
+            match = '"' + search.replace('"', '""') + '"'
+            stocks = await fetch_all(STOCKS_AVAILABLE_FTS_SQL, {"q": match, "limit": limit})
+        else:
+            search_term = f"%{search}%" if search else "%"
+            stocks = await fetch_all(STOCKS_AVAILABLE_SQL, {"search": search_term, "limit": limit})
         return {"stocks": stocks, "count": len(stocks)}
     except Exception as e:
         return JSONResponse(status_code=200, content={"error": str(e), "stocks": []})
@@ -3331,6 +4245,34 @@ async def api_available_stocks(search: str = "", limit: int = 100):
 # Client Preferences / Investment Goals
 # =========================
 
+def _goal(goal: str, description: str, source: str) -> Dict[str, str]:
+    return {"goal": goal, "icon": "", "description": description, "source": source}
+
+
+# Fixed goals: stated ones keyed by their src_client_preferences flag,
+# inferred ones by risk appetite (anything else gets the balanced goal)
+STATED_STYLE_GOALS = (
+    ("prefers_dividends", _goal("Dividend Income", "Focus on dividend-paying stocks", "stated")),
+    ("prefers_growth", _goal("Growth Stocks", "Focus on capital appreciation", "stated")),
+    ("prefers_esg", _goal("ESG Focus", "Environmental, Social, Governance criteria", "stated")),
+    ("prefers_value", _goal("Value Investing", "Undervalued stocks with margin of safety", "stated")),
+    ("prefers_momentum", _goal("Momentum Strategy", "Following market trends", "stated")),
+)
+INFERRED_RISK_GOALS = {
+    "Aggressive": (
+        _goal("Alpha Generation", "Seeking high returns (inferred)", "inferred"),
+        _goal("Growth Stocks", "Focus on capital appreciation (inferred)", "inferred"),
+    ),
+    "Conservative": (
+        _goal("Capital Preservation", "Prioritizing stability (inferred)", "inferred"),
+        _goal("Dividend Income", "Seeking income streams (inferred)", "inferred"),
+    ),
+}
+INFERRED_BALANCED_GOALS = (
+    _goal("Balanced Growth", "Mix of growth and income (inferred)", "inferred"),
+)
+
+
 @app.get("/api/client/{client_id}/preferences")
 async def api_client_preferences(client_id: int):
     """
@@ -3338,103 +4280,124 @@ async def api_client_preferences(client_id: int):
     Uses real preferences from database if available, otherwise infers from behavior.
     """
     try:
-        goals = []
+        return await get_client_preferences(client_id)
+    except Exception as e:
+        return JSONResponse(status_code=200, content={"error": str(e), "goals": []})
+
+
+# The UI polls this per client; cleared on writes to any source table
+@async_ttl_cache(ttl=60, maxsize=1024, tables=CLIENT_CONTEXT_TABLES + ("src_client_preferences",))
+async def get_client_preferences(client_id: int) -> Dict[str, Any]:
+    """Preference/goal payload for api_client_preferences."""
+    goals = []
 
-        # First, try to get REAL preferences from database
-        real_prefs = await fetch_one(
+    # REAL preferences from the database plus supporting data, fetched together
+    real_prefs, psum, profile, conviction = await asyncio.gather(
+        fetch_one(
             """
             SELECT * FROM src_client_preferences WHERE client_id = :client_id
             """,
             {"client_id": client_id},
-        )
+        ),
+        get_client_portfolio_summary(client_id),
+        get_client_profile(client_id),
+        get_conviction(client_id),
+    )
 
-        # Get supporting data
-        psum = await get_client_portfolio_summary(client_id)
-        profile = await get_client_profile(client_id)
-        conviction = await get_conviction(client_id)
-
-        # If we have real preferences, use them
-        if real_prefs:
-            if real_prefs.get("prefers_dividends"):
-                goals.append({"goal": "Dividend Income", "icon": "", "description": "Focus on dividend-paying stocks", "source": "stated"})
-            if real_prefs.get("prefers_growth"):
-                goals.append({"goal": "Growth Stocks", "icon": "", "description": "Focus on capital appreciation", "source": "stated"})
-            if real_prefs.get("prefers_esg"):
-                goals.append({"goal": "ESG Focus", "icon": "", "description": "Environmental, Social, Governance criteria", "source": "stated"})
-            if real_prefs.get("prefers_value"):
-                goals.append({"goal": "Value Investing", "icon": "", "description": "Undervalued stocks with margin of safety", "source": "stated"})
-            if real_prefs.get("prefers_momentum"):
-                goals.append({"goal": "Momentum Strategy", "icon": "", "description": "Following market trends", "source": "stated"})
-
-            # Sector preferences
-            if real_prefs.get("preferred_sectors"):
-                sectors = real_prefs["preferred_sectors"].split(",")[:3]
-                goals.append({"goal": f"Sectors: {', '.join(sectors)}", "icon": "", "description": "Preferred sector exposure", "source": "stated"})
-
-            # Theme preferences
-            if real_prefs.get("preferred_themes"):
-                themes = real_prefs["preferred_themes"].split(",")[:2]
-                for theme in themes:
-                    goals.append({"goal": f"{theme.strip()} Theme", "icon": "", "description": "Thematic focus", "source": "stated"})
-
-            # Risk constraints
-            if real_prefs.get("max_volatility"):
-                vol_pct = int(real_prefs["max_volatility"] * 100)
-                goals.append({"goal": f"Max Vol: {vol_pct}%", "icon": "", "description": f"Volatility limit: {vol_pct}%", "source": "stated"})
-
-            if real_prefs.get("min_dividend_yield"):
-                yield_pct = real_prefs["min_dividend_yield"] * 100
-                goals.append({"goal": f"Min Yield: {yield_pct:.1f}%", "icon": "", "description": f"Minimum dividend yield requirement", "source": "stated"})
+    # If we have real preferences, use them
+    if real_prefs:
+        goals.extend(dict(goal) for field, goal in STATED_STYLE_GOALS if real_prefs.get(field))
 
-            return {
-                "client_id": client_id,
-                "goals": goals,
-                "risk_profile": profile.get("risk_appetite", "Moderate"),
-                "investment_style": profile.get("investment_style", "Fundamental"),
-                "top_sector": psum.get("top_sector", ""),
-                "top_theme": psum.get("top_theme", ""),
-                "conviction_level": conviction.get("conviction_level", "Unknown"),
-                "preference_notes": real_prefs.get("preference_notes", ""),
-                "has_real_preferences": True,
-            }
+        # Sector preferences
+        if real_prefs.get("preferred_sectors"):
+            sectors = real_prefs["preferred_sectors"].split(",")[:3]
+            goals.append({"goal": f"Sectors: {', '.join(sectors)}", "icon": "", "description": "Preferred sector exposure", "source": "stated"})
 
-        # Fall back to INFERRED preferences if no real data
-        risk_appetite = profile.get("risk_appetite", "Moderate")
-        if risk_appetite == "Aggressive":
-            goals.append({"goal": "Alpha Generation", "icon": "", "description": "Seeking high returns (inferred)", "source": "inferred"})
-            goals.append({"goal": "Growth Stocks", "icon": "", "description": "Focus on capital appreciation (inferred)", "source": "inferred"})
-        elif risk_appetite == "Conservative":
-            goals.append({"goal": "Capital Preservation", "icon": "", "description": "Prioritizing stability (inferred)", "source": "inferred"})
-            goals.append({"goal": "Dividend Income", "icon": "", "description": "Seeking income streams (inferred)", "source": "inferred"})
-        else:
-            goals.append({"goal": "Balanced Growth", "icon": "", "description": "Mix of growth and income (inferred)", "source": "inferred"})
+        # Theme preferences
+        if real_prefs.get("preferred_themes"):
+            themes = real_prefs["preferred_themes"].split(",")[:2]
+            for theme in themes:
+                goals.append({"goal": f"{theme.strip()} Theme", "icon": "", "description": "Thematic focus", "source": "stated"})
 
-        top_sector = psum.get("top_sector", "")
-        if top_sector:
-            goals.append({"goal": f"{top_sector} Focus", "icon": "", "description": f"Primary sector exposure (inferred)", "source": "inferred"})
+        # Risk constraints
+        if real_prefs.get("max_volatility"):
+            vol_pct = int(real_prefs["max_volatility"] * 100)
+            goals.append({"goal": f"Max Vol: {vol_pct}%", "icon": "", "description": f"Volatility limit: {vol_pct}%", "source": "stated"})
 
-        top_theme = psum.get("top_theme", "")
-        if top_theme and top_theme.lower() not in ["none", "null", ""]:
-            goals.append({"goal": f"{top_theme} Theme", "icon": "", "description": "Thematic focus (inferred)", "source": "inferred"})
+        if real_prefs.get("min_dividend_yield"):
+            yield_pct = real_prefs["min_dividend_yield"] * 100
+            goals.append({"goal": f"Min Yield: {yield_pct:.1f}%", "icon": "", "description": f"Minimum dividend yield requirement", "source": "stated"})
 
         return {
             "client_id": client_id,
             "goals": goals,
-            "risk_profile": risk_appetite,
+            "risk_profile": profile.get("risk_appetite", "Moderate"),
             "investment_style": profile.get("investment_style", "Fundamental"),
-            "top_sector": top_sector,
-            "top_theme": top_theme,
+            "top_sector": psum.get("top_sector", ""),
+            "top_theme": psum.get("top_theme", ""),
             "conviction_level": conviction.get("conviction_level", "Unknown"),
-            "has_real_preferences": False,
+            "preference_notes": real_prefs.get("preference_notes", ""),
+            "has_real_preferences": True,
         }
-    except Exception as e:
-        return JSONResponse(status_code=200, content={"error": str(e), "goals": []})
+
+    # Fall back to INFERRED preferences if no real data
+    risk_appetite = profile.get("risk_appetite", "Moderate")
+    goals.extend(dict(goal) for goal in INFERRED_RISK_GOALS.get(risk_appetite, INFERRED_BALANCED_GOALS))
+
+    top_sector = psum.get("top_sector", "")
+    if top_sector:
+        goals.append({"goal": f"{top_sector} Focus", "icon": "", "description": f"Primary sector exposure (inferred)", "source": "inferred"})
+
+    top_theme = psum.get("top_theme", "")
+    if top_theme and top_theme.lower() not in ["none", "null", ""]:
+        goals.append({"goal": f"{top_theme} Theme", "icon": "", "description": "Thematic focus (inferred)", "source": "inferred"})
+
+    return {
+        "client_id": client_id,
+        "goals": goals,
+        "risk_profile": risk_appetite,
+        "investment_style": profile.get("investment_style", "Fundamental"),
+        "top_sector": top_sector,
+        "top_theme": top_theme,
+        "conviction_level": conviction.get("conviction_level", "Unknown"),
+        "has_real_preferences": False,
+    }
 
 
 # =========================
 # Best Contact Time Analysis
 # =========================
 
+# Each call (day, hour) group scores 2*calls + 0.5*avg duration and each
+# trade group 1.5*trades + 3*large trades; groups are then summed per
+# weekday and per hour. n counts the groups behind each total. Timestamps
+# strftime can't parse (e.g. '2023-04-05 9:00:00') are skipped.
+CONTACT_ACTIVITY_SQL = """
+    WITH grp AS (
+        SELECT
+            strftime('%w', call_timestamp) AS d,
+            strftime('%H', call_timestamp) AS h,
+            COUNT(*) * 2 + COALESCE(AVG(duration_minutes), 0) * 0.5 AS s
+        FROM src_call_logs
+        WHERE client_id = :client_id
+        GROUP BY d, h
+        UNION ALL
+        SELECT
+            strftime('%w', trade_timestamp) AS d,
+            strftime('%H', trade_timestamp) AS h,
+            COUNT(*) * 1.5 + SUM(CASE WHEN notional_bucket = 'Large' THEN 1 ELSE 0 END) * 3 AS s
+        FROM src_trade_executions
+        WHERE client_id = :client_id
+        GROUP BY d, h
+    )
+    SELECT 'day' AS kind, CAST(d AS INTEGER) AS k, SUM(s) AS score, COUNT(*) AS n
+    FROM grp WHERE d IS NOT NULL GROUP BY d
+    UNION ALL
+    SELECT 'hour' AS kind, CAST(h AS INTEGER) AS k, SUM(s) AS score, COUNT(*) AS n
+    FROM grp WHERE d IS NOT NULL GROUP BY h
+"""
+
+
 @app.get("/api/client/{client_id}/best_contact_time")
 async def api_best_contact_time(client_id: int):
     """
@@ -3442,64 +4405,21 @@ async def api_best_contact_time(client_id: int):
     Uses autocorrelation of activity patterns.
     """
     try:
-        # Analyze call timing patterns
-        call_patterns = await fetch_all(
-            """
-            SELECT
-                strftime('%w', call_timestamp) as day_of_week,
-                strftime('%H', call_timestamp) as hour_of_day,
-                COUNT(*) as call_count,
-                AVG(duration_minutes) as avg_duration
-            FROM src_call_logs
-            WHERE client_id = :client_id
-            GROUP BY day_of_week, hour_of_day
-            ORDER BY call_count DESC
-            """,
-            {"client_id": client_id},
-        )
-
-        # Analyze trade timing patterns (when they're most active)
-        trade_patterns = await fetch_all(
-            """
-            SELECT
-                strftime('%w', trade_timestamp) as day_of_week,
-                strftime('%H', trade_timestamp) as hour_of_day,
-                COUNT(*) as trade_count,
-                SUM(CASE WHEN notional_bucket = 'Large' THEN 1 ELSE 0 END) as large_trades
-            FROM src_trade_executions
-            WHERE client_id = :client_id
-            GROUP BY day_of_week, hour_of_day
-            ORDER BY trade_count DESC
-            """,
-            {"client_id": client_id},
-        )
+        # Call and trade timing patterns, scored and summed in SQL
+        activity = await fetch_all(CONTACT_ACTIVITY_SQL, {"client_id": client_id})
+        day_scores: Dict[int, float] = {}
+        hour_scores: Dict[int, float] = {}
+        total_data_points = 0
+        for r in activity:
+            if r["kind"] == "day":
+                day_scores[r["k"]] = r["score"]
+                total_data_points += r["n"]
+            else:
+                hour_scores[r["k"]] = r["score"]
 
         # Day names
         day_names = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
 
-        # Find best day and time
-        best_day = None
-        best_hour = None
-        best_score = 0
-
-        # Combine call and trade patterns
-        day_scores = {}
-        hour_scores = {}
-
-        for c in call_patterns:
-            day = int(c.get("day_of_week", 0))
-            hour = int(c.get("hour_of_day", 9))
-            score = (c.get("call_count", 0) * 2) + (c.get("avg_duration", 0) * 0.5)
-            day_scores[day] = day_scores.get(day, 0) + score
-            hour_scores[hour] = hour_scores.get(hour, 0) + score
-
-        for t in trade_patterns:
-            day = int(t.get("day_of_week", 0))
-            hour = int(t.get("hour_of_day", 9))
-            score = (t.get("trade_count", 0) * 1.5) + (t.get("large_trades", 0) * 3)
-            day_scores[day] = day_scores.get(day, 0) + score
-            hour_scores[hour] = hour_scores.get(hour, 0) + score
-
         # Find best day
         if day_scores:
             best_day_num = max(day_scores, key=day_scores.get)
@@ -3518,8 +4438,7 @@ async def api_best_contact_time(client_id: int):
         hour_end = min(best_hour + 2, 18)
         time_range = f"{best_hour:02d}:00 - {hour_end:02d}:00"
 
-        # Confidence based on data points
-        total_data_points = len(call_patterns) + len(trade_patterns)
+        # Confidence based on data points (call + trade day/hour groups)
         if total_data_points >= 20:
             confidence = "High"
         elif total_data_points >= 10:
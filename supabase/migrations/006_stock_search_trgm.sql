@@ -0,0 +1,17 @@
+-- ============================================================================
+-- TRIGRAM INDEXES FOR THE ANALYST STOCK PICKER
+-- Migration: 006_stock_search_trgm.sql
+-- ============================================================================
+
+-- /api/stocks/available filters src_stocks with LIKE '%term%' on ticker,
+-- company name and sector; GIN trigram indexes let those use an index
+-- instead of a sequential scan.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_stocks_ticker_trgm ON src_stocks USING gin (ticker gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stocks_company_trgm ON src_stocks USING gin (company_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stocks_sector_trgm ON src_stocks USING gin (sector gin_trgm_ops);
+
+-- ============================================================================
+-- END OF MIGRATION
+-- ============================================================================
@@ -6,17 +6,39 @@ Exports data from SQLite and generates PostgreSQL-compatible INSERT statements.
 Usage:
     python migrate_data.py --sqlite-path ../data.db --output 002_seed_data.sql
 
+    Add --format copy to write COPY blocks instead of INSERTs (load with psql -f).
+
 Or import directly to Supabase:
     python migrate_data.py --sqlite-path ../data.db --supabase-url $SUPABASE_URL --supabase-key $SUPABASE_SERVICE_KEY
+
+Or bulk-load directly into PostgreSQL with COPY (fastest):
+    python migrate_data.py --sqlite-path ../data.db --postgres-dsn $DATABASE_URL
 """
 
+import io
 import os
 import sys
+import queue
+import shutil
+import tempfile
+import threading
 import json
 import sqlite3
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from urllib.request import pathname2url
+from typing import Any, Generator, Iterable, Iterator, List, Optional
+
+# Optional: faster JSON encoding for jsonb values
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Optional: Direct Supabase import
 try:
@@ -25,6 +47,13 @@ try:
 except ImportError:
     HAS_SUPABASE = False
 
+# Optional: Direct PostgreSQL import via COPY
+try:
+    import psycopg2
+    HAS_PSYCOPG2 = True
+except ImportError:
+    HAS_PSYCOPG2 = False
+
 
 # Table migration order (respects foreign key dependencies)
 MIGRATION_ORDER = [
@@ -156,94 +185,364 @@ COLUMN_MAPPINGS = {
 }
 
 
-def escape_sql_string(value: Any) -> str:
-    """Escape a value for PostgreSQL SQL insertion."""
-    if value is None:
-        return "NULL"
+# Quotes are doubled; newlines/carriage returns become literal \n / \r
+_STR_ESCAPES = str.maketrans({"'": "''", "\n": "\\n", "\r": "\\r"})
+
+
+def _escape_str(value: str) -> str:
+    if "'" in value or "\n" in value or "\r" in value:
+        value = value.translate(_STR_ESCAPES)
+    return f"'{value}'"
+
+
+# Low-cardinality columns (currency, region, sector, dates...) repeat the same
+# short strings on every row; their escaped form is memoized.
+SHORT_STR_LEN = 64
+_escape_short_str = lru_cache(maxsize=8192)(_escape_str)
+
+
+def _escape_json(value: dict) -> str:
+    # Only jsonb semantics matter, so orjson's compact output is equivalent
+    json_str = orjson.dumps(value).decode() if HAS_ORJSON else json.dumps(value)
+    json_str = json_str.replace("'", "''")
+    return f"'{json_str}'::jsonb"
+
+
+def _escape_other(value: Any) -> str:
+    """Subclasses of the dispatched types, and anything else as a quoted string."""
     if isinstance(value, bool):
         return "TRUE" if value else "FALSE"
     if isinstance(value, (int, float)):
         return str(value)
     if isinstance(value, str):
-        # Escape single quotes by doubling them
-        escaped = value.replace("'", "''")
-        # Handle newlines and special characters
-        escaped = escaped.replace("\n", "\\n").replace("\r", "\\r")
-        return f"'{escaped}'"
+        return _escape_str(value)
     if isinstance(value, dict):
-        # JSON/JSONB
-        json_str = json.dumps(value).replace("'", "''")
-        return f"'{json_str}'::jsonb"
+        return _escape_json(value)
     return f"'{str(value)}'"
 
 
-def get_sqlite_data(conn: sqlite3.Connection, table: str) -> tuple:
-    """Fetch all data from a SQLite table."""
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+# Exact type -> SQL literal formatter; one dict lookup per cell
+_ESCAPERS = {
+    type(None): lambda value: "NULL",
+    bool: lambda value: "TRUE" if value else "FALSE",
+    int: str,
+    float: str,
+    str: _escape_str,
+    dict: _escape_json,
+}
 
-    try:
-        cursor.execute(f"SELECT * FROM {table}")
-        rows = cursor.fetchall()
 
-        if not rows:
-            return [], []
+def escape_sql_string(value: Any) -> str:
+    """Escape a value for PostgreSQL SQL insertion."""
+    return _ESCAPERS.get(type(value), _escape_other)(value)
+
+
+# The export is a read-only sequential scan of every table: big page cache,
+# memory-mapped reads, temp sorts in RAM.
+SOURCE_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-262144",  # 256 MB
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def open_sqlite_source(sqlite_path: str) -> sqlite3.Connection:
+    """Open the source database read-only, tuned for full-table scans."""
+    # mode=ro rather than immutable=1: immutable would ignore a pending WAL
+    uri = f"file:{pathname2url(sqlite_path)}?mode=ro"
+    # check_same_thread=False: prefetch_batches reads the cursor from a helper thread
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    for pragma in SOURCE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_sqlite_data(conn: sqlite3.Connection, table: str, batch_size: int = 100) -> tuple:
+    """Open a cursor over the migrated columns of a SQLite table.
+
+    Columns that COLUMN_MAPPINGS drops are left out of the SELECT, so SQLite
+    never decodes them. Returns (columns, rows): `rows` iterates plain tuples
+    in `columns` order straight off the cursor, so read it in batches to hold
+    only one in memory. Emptiness is detected from the first fetchmany (no
+    COUNT(*) pass); rows is None if the table is empty or can't be read.
+    """
+    cursor = conn.cursor()
+    mapping = COLUMN_MAPPINGS.get(table, {})
 
-        columns = rows[0].keys()
-        data = [dict(row) for row in rows]
-        return list(columns), data
+    try:
+        table_info = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+        columns = [col[1] for col in table_info if mapping.get(col[1], col[1]) is not None]
+        if not columns:
+            raise ValueError("no such table or no migrated columns")
+        select_list = ", ".join(f'"{col}"' for col in columns)
+        cursor.execute(f"SELECT {select_list} FROM {table}")
+        cursor.arraysize = batch_size
+        first = cursor.fetchmany()
+        if not first:
+            return columns, None
+        return columns, chain(first, cursor)
     except Exception as e:
         print(f"Warning: Could not read table {table}: {e}")
-        return [], []
+        return [], None
+
+
+def iter_batches(rows: Iterable[tuple], batch_size: int) -> Iterator[List[tuple]]:
+    """Yield lists of up to batch_size rows until `rows` (e.g. a cursor) is exhausted."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+PREFETCH_DEPTH = 4
+
+
+def prefetch_batches(rows: Iterable[tuple], batch_size: int, depth: int = PREFETCH_DEPTH) -> Iterator[List[tuple]]:
+    """iter_batches, with the next batches read by a background thread.
+
+    sqlite3 releases the GIL while stepping the cursor, so reading overlaps
+    with formatting the current batch. At most `depth` batches are buffered.
+    """
+    q: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            for batch in iter_batches(rows, batch_size):
+                if not put(batch):
+                    return
+            put(done)
+        except BaseException as e:
+            put(e)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+# PostgreSQL caps a statement at 65535 bind parameters; sizing literal
+# INSERT batches the same way keeps statements a sensible size while
+# cutting the statement count (parse/plan/WAL overhead) for narrow tables.
+PG_MAX_PARAMS = 65535
+MAX_INSERT_ROWS = 10000
+
+
+def insert_batch_size(n_columns: int) -> int:
+    """Rows per INSERT statement for a table with n_columns migrated columns."""
+    return max(1, min(MAX_INSERT_ROWS, PG_MAX_PARAMS // n_columns))
+
+
+# PostgREST has no parameter limit, but request bodies should stay well
+# under its payload cap.
+SUPABASE_MAX_BATCH = 1000
+SUPABASE_MAX_PAYLOAD = 1_000_000  # bytes
+
+
+def supabase_batch_size(sample: List[dict]) -> int:
+    """Rows per upsert request, estimated from the JSON size of sample rows."""
+    avg_row_bytes = len(json.dumps(sample, default=str)) / len(sample)
+    return max(1, min(SUPABASE_MAX_BATCH, int(SUPABASE_MAX_PAYLOAD // avg_row_bytes)))
+
+
+def map_columns(table: str, columns: List[str]) -> List[str]:
+    """Resolve COLUMN_MAPPINGS once per table.
+
+    `columns` is already limited to migrated columns by get_sqlite_data, so
+    rows are used as-is; this returns their PostgreSQL names in row order.
+    """
+    mapping = COLUMN_MAPPINGS.get(table, {})
+    return [mapping.get(col, col) for col in columns]  # Default to same name
+
+
+def sniff_column_types(rows: List[tuple]) -> tuple:
+    """Type of the first non-NULL value in each column (None if all NULL)."""
+    return tuple(
+        next((type(value) for value in values if value is not None), None)
+        for values in zip(*rows)
+    )
+
+
+# Date/timestamp columns (SQLite names). SQLite stores them as ISO strings,
+# so they skip the full escape; a value containing a quote still gets one.
+TRUSTED_COLUMNS = {
+    "src_clients": {"created_at", "updated_at"},
+    "src_stocks": {"created_at"},
+    "src_reports": {"publish_timestamp", "created_at"},
+    "src_call_logs": {"call_timestamp", "created_at"},
+    "src_trade_executions": {"trade_timestamp", "created_at"},
+    "src_portfolio_snapshots": {"as_of_date", "created_at"},
+    "src_readership_events": {"read_timestamp", "created_at"},
+    "src_stock_prices": {"price_date"},
+    "src_stock_returns": {"return_date"},
+    "src_stock_volatility": {"vol_date"},
+    "int_story_context_snapshot": {"created_at"},
+}
+TRUSTED = "trusted"  # column type marker for row_formatter
+
+# Cell templates for columns whose type is known; any other value (NULL, or
+# a type that differs from the sniffed one) goes through escape_sql_string.
+_CELL_TEMPLATES = {
+    TRUSTED: (
+        "{{(_Q + v{i} + _Q if _Q not in v{i} else _escape_str(v{i}))"
+        " if type(v{i}) is str else _escape(v{i})}}"
+    ),
+    int: "{{v{i} if type(v{i}) is int else _escape(v{i})}}",
+    float: "{{v{i} if type(v{i}) is float else _escape(v{i})}}",
+    str: (
+        "{{(_escape_short(v{i}) if len(v{i}) <= SHORT_STR_LEN else _escape_str(v{i}))"
+        " if type(v{i}) is str else _escape(v{i})}}"
+    ),
+}
+_ROW_FORMATTERS = {}
+
+
+def row_formatter(types: tuple):
+    """Build (and cache) a function rendering one row as a VALUES tuple.
+
+    The function is generated for the column types so each cell is a
+    single type check inside one f-string, instead of a dispatch call.
+    """
+    fmt = _ROW_FORMATTERS.get(types)
+    if fmt is None:
+        names = "".join(f"v{i}, " for i in range(len(types)))
+        cells = [
+            _CELL_TEMPLATES.get(t, "{{_escape(v{i})}}").format(i=i)
+            for i, t in enumerate(types)
+        ]
+        src = f'def fmt(row):\n    {names}= row\n    return f"({", ".join(cells)})"\n'
+        namespace = {
+            "_escape": escape_sql_string,
+            "_escape_str": _escape_str,
+            "_escape_short": _escape_short_str,
+            "SHORT_STR_LEN": SHORT_STR_LEN,
+            "_Q": "'",
+        }
+        exec(compile(src, f"<row_formatter {types}>", "exec"), namespace)
+        fmt = _ROW_FORMATTERS[types] = namespace["fmt"]
+    return fmt
 
 
 def generate_insert_sql(
     table: str,
     columns: List[str],
-    data: List[Dict[str, Any]],
-    batch_size: int = 100
-) -> str:
-    """Generate PostgreSQL INSERT statements."""
-    if not data:
-        return f"-- No data for {table}\n"
-
-    # Get column mapping
-    mapping = COLUMN_MAPPINGS.get(table, {})
-
-    # Filter and map columns
-    pg_columns = []
-    sqlite_columns = []
-    for col in columns:
-        pg_col = mapping.get(col, col)  # Default to same name
-        if pg_col is not None:
-            pg_columns.append(pg_col)
-            sqlite_columns.append(col)
+    rows: Iterable[tuple],
+    batch_size: Optional[int] = None
+) -> Generator[str, None, int]:
+    """Generate PostgreSQL INSERT statements, one chunk per batch of rows.
+
+    batch_size defaults to insert_batch_size() for the table's width. The
+    row total is written after the last statement and returned when the
+    generator finishes (see write_chunks).
+    """
+    pg_columns = map_columns(table, columns)
+    yield f"\n-- {table}\n"
+
+    batch_size = batch_size or insert_batch_size(len(pg_columns))
+    col_names = ", ".join(pg_columns)
+    # Statement head/tail wrap the joined rows in one join (no concatenation copies)
+    frame = (f"\nINSERT INTO {table} ({col_names}) VALUES\n", "\nON CONFLICT DO NOTHING;\n")
+    trusted = TRUSTED_COLUMNS.get(table, ())
+    fmt = None
+    row_count = 0
+    for batch in prefetch_batches(rows, batch_size):
+        if fmt is None:
+            types = tuple(
+                TRUSTED if t is str and col in trusted else t
+                for col, t in zip(columns, sniff_column_types(batch))
+            )
+            fmt = row_formatter(types)
+        row_count += len(batch)
+        yield ",\n".join(map(fmt, batch)).join(frame)
+    yield f"-- {table}: {row_count} rows\n"
+    return row_count
 
-    if not pg_columns:
-        return f"-- No mappable columns for {table}\n"
 
-    sql_parts = [f"\n-- {table} ({len(data)} rows)\n"]
+# COPY text format: backslash, tab, newline and CR are backslash-escaped; \N is NULL
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+# The SQL file's INSERT literals store newlines/CRs as the two characters
+# \n / \r (_STR_ESCAPES); the file's COPY blocks must load the same text.
+_COPY_SEED_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\\\n", "\r": "\\\\r"})
 
-    # Process in batches
-    for i in range(0, len(data), batch_size):
-        batch = data[i:i + batch_size]
 
-        values_list = []
-        for row in batch:
-            values = []
-            for sqlite_col in sqlite_columns:
-                val = row.get(sqlite_col)
-                values.append(escape_sql_string(val))
-            values_list.append(f"({', '.join(values)})")
+def _copy_value(value: Any, escapes: dict = _COPY_ESCAPES) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.translate(escapes)
+    return str(value)
+
+
+def _rows_to_copy_text(rows: List[tuple], escapes: dict = _COPY_ESCAPES) -> io.StringIO:
+    """Render rows as COPY ... FROM STDIN text-format input."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join([_copy_value(value, escapes) for value in row]))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+def copy_staging_sql(table: str, col_names: str) -> tuple:
+    """Statements that load `table` through a staging table.
+
+    COPY has no ON CONFLICT, so rows are copied into a temp table and then
+    inserted with ON CONFLICT DO NOTHING. Returns (create, copy, insert).
+    """
+    staging = f"_stage_{table}"
+    return (
+        f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP",
+        f"COPY {staging} ({col_names}) FROM STDIN",
+        f"INSERT INTO {table} ({col_names}) SELECT {col_names} FROM {staging} "
+        "ON CONFLICT DO NOTHING",
+    )
 
-        col_names = ", ".join(pg_columns)
-        sql_parts.append(
-            f"INSERT INTO {table} ({col_names}) VALUES\n" +
-            ",\n".join(values_list) +
-            "\nON CONFLICT DO NOTHING;\n"
-        )
 
-    return "\n".join(sql_parts)
+def generate_copy_sql(
+    table: str,
+    columns: List[str],
+    rows: Iterable[tuple],
+    batch_size: int = 10000,
+) -> Generator[str, None, int]:
+    """Generate a psql COPY ... FROM STDIN block for a table, one chunk per batch.
+
+    Loads the same rows as generate_insert_sql, but psql streams them
+    straight into COPY instead of parsing an INSERT per batch. Rows use
+    COPY's text format (tab-separated, \\N for NULL) rather than CSV. Unlike
+    the --postgres-dsn import, newlines and CRs load as the literal text
+    \\n / \\r, matching the INSERT output. Returns the row total, like
+    generate_insert_sql.
+    """
+    create, copy, insert = copy_staging_sql(table, ", ".join(map_columns(table, columns)))
+    yield f"\n-- {table}\n{create};\n{copy};\n"
+    row_count = 0
+    for batch in prefetch_batches(rows, batch_size):
+        row_count += len(batch)
+        yield _rows_to_copy_text(batch, _COPY_SEED_ESCAPES).getvalue()
+    yield f"\\.\n{insert};\n-- {table}: {row_count} rows\n"
+    return row_count
 
 
 def reset_sequences_sql(tables: List[str]) -> str:
@@ -265,58 +564,115 @@ def reset_sequences_sql(tables: List[str]) -> str:
         "int_story_context_snapshot": ("snapshot_id", "int_story_context_snapshot_snapshot_id_seq"),
     }
 
+    # One DO block: a single statement to parse and run instead of one per sequence
+    sql_parts.append("DO $$\nBEGIN\n")
     for table in tables:
         if table in sequence_map:
             id_col, seq_name = sequence_map[table]
             sql_parts.append(
-                f"SELECT setval('{seq_name}', COALESCE((SELECT MAX({id_col}) FROM {table}), 0) + 1, false);\n"
+                f"  PERFORM setval('{seq_name}', COALESCE((SELECT MAX({id_col}) FROM {table}), 0) + 1, false);\n"
             )
+    sql_parts.append("END $$;\n")
 
     return "".join(sql_parts)
 
 
-def migrate_to_sql_file(sqlite_path: str, output_path: str):
-    """Export SQLite data to a PostgreSQL SQL file."""
-    print(f"Reading from: {sqlite_path}")
-    print(f"Writing to: {output_path}")
-
-    conn = sqlite3.connect(sqlite_path)
+# Output files are written through a large buffer in a few big syscalls
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
 
-    sql_parts = [
-        "-- ============================================================================\n",
-        "-- SALES INTELLIGENCE PLATFORM - Data Migration\n",
-        f"-- Generated: {datetime.now().isoformat()}\n",
-        "-- Source: SQLite database\n",
-        "-- ============================================================================\n\n",
-        "BEGIN;\n\n",
-    ]
 
-    migrated_tables = []
+# --format for the SQL file export
+SQL_GENERATORS = {
+    "insert": generate_insert_sql,
+    "copy": generate_copy_sql,
+}
 
-    for table in MIGRATION_ORDER:
-        columns, data = get_sqlite_data(conn, table)
 
-        if data:
-            print(f"  {table}: {len(data)} rows")
-            sql_parts.append(generate_insert_sql(table, columns, data))
-            migrated_tables.append(table)
-        else:
-            print(f"  {table}: (empty or not found)")
+def write_chunks(f, chunks: Generator[str, None, Any]) -> Any:
+    """Write a SQL generator's chunks to binary file f; return its return value."""
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration as done:
+            return done.value
+        f.write(chunk.encode("utf-8"))
 
-    # Reset sequences
-    sql_parts.append(reset_sequences_sql(migrated_tables))
 
-    # Refresh materialized views
-    sql_parts.append("\n-- Refresh materialized views\n")
-    sql_parts.append("SELECT refresh_all_analytics_views();\n")
+def export_table_sql(sqlite_path: str, table: str, out_dir: str, output_format: str = "insert") -> tuple:
+    """Write one table's INSERT statements (or COPY block) to a file in out_dir.
 
-    sql_parts.append("\nCOMMIT;\n")
+    Runs in a worker process with its own connection. Returns
+    (row_count, path); path is None when the table is empty or missing.
+    """
+    conn = open_sqlite_source(sqlite_path)
+    try:
+        columns, rows = get_sqlite_data(conn, table)
+        if rows is None:
+            return 0, None
+        path = os.path.join(out_dir, f"{table}.sql")
+        with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            row_count = write_chunks(f, SQL_GENERATORS[output_format](table, columns, rows))
+        return row_count, path
+    finally:
+        conn.close()
+
+
+def migrate_to_sql_file(
+    sqlite_path: str,
+    output_path: str,
+    workers: Optional[int] = None,
+    output_format: str = "insert",
+):
+    """Export SQLite data to a PostgreSQL SQL file.
+
+    Tables are formatted in parallel worker processes, then concatenated
+    in MIGRATION_ORDER so foreign-key order is kept. output_format "copy"
+    writes COPY ... FROM STDIN blocks, which only psql can load.
+    """
+    print(f"Reading from: {sqlite_path}")
+    print(f"Writing to: {output_path}")
 
-    conn.close()
+    workers = workers or min(len(MIGRATION_ORDER), os.cpu_count() or 1)
+    migrated_tables = []
 
-    # Write output
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("".join(sql_parts))
+    with tempfile.TemporaryDirectory() as out_dir, \
+            ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(output_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        futures = [
+            pool.submit(export_table_sql, sqlite_path, table, out_dir, output_format)
+            for table in MIGRATION_ORDER
+        ]
+
+        f.write((
+            "-- ============================================================================\n"
+            "-- SALES INTELLIGENCE PLATFORM - Data Migration\n"
+            f"-- Generated: {datetime.now().isoformat()}\n"
+            "-- Source: SQLite database\n"
+            "-- ============================================================================\n\n"
+            "BEGIN;\n\n"
+        ).encode("utf-8"))
+
+        for table, future in zip(MIGRATION_ORDER, futures):
+            row_count, path = future.result()
+
+            if path:
+                print(f"  {table}: {row_count} rows")
+                # Already UTF-8: copy the bytes without decoding
+                with open(path, "rb") as part:
+                    shutil.copyfileobj(part, f, WRITE_BUFFER_SIZE)
+                os.remove(path)
+                migrated_tables.append(table)
+            else:
+                print(f"  {table}: (empty or not found)")
+
+        # Reset sequences
+        f.write(reset_sequences_sql(migrated_tables).encode("utf-8"))
+
+        # Refresh materialized views
+        f.write(b"\n-- Refresh materialized views\n")
+        f.write(b"SELECT refresh_all_analytics_views();\n")
+
+        f.write(b"\nCOMMIT;\n")
 
     print(f"\nMigration SQL written to: {output_path}")
     print(f"Total tables migrated: {len(migrated_tables)}")
@@ -332,53 +688,102 @@ def migrate_to_supabase(sqlite_path: str, supabase_url: str, supabase_key: str):
     print(f"Importing to: {supabase_url}")
 
     supabase: Client = create_client(supabase_url, supabase_key)
-    conn = sqlite3.connect(sqlite_path)
+    conn = open_sqlite_source(sqlite_path)
 
     for table in MIGRATION_ORDER:
-        columns, data = get_sqlite_data(conn, table)
+        columns, rows = get_sqlite_data(conn, table, SUPABASE_MAX_BATCH)
 
-        if not data:
+        if rows is None:
             print(f"  {table}: (empty or not found)")
             continue
 
         # Map columns
-        mapping = COLUMN_MAPPINGS.get(table, {})
-        mapped_data = []
-
-        for row in data:
-            mapped_row = {}
-            for sqlite_col, val in row.items():
-                pg_col = mapping.get(sqlite_col, sqlite_col)
-                if pg_col is not None:
-                    mapped_row[pg_col] = val
-            mapped_data.append(mapped_row)
-
-        # Insert in batches
-        batch_size = 500
-        for i in range(0, len(mapped_data), batch_size):
-            batch = mapped_data[i:i + batch_size]
+        pg_columns = map_columns(table, columns)
+
+        def to_record(row):
+            return dict(zip(pg_columns, row))
+
+        # Size batches from the first rows, then insert in batches
+        sample = list(islice(rows, 100))
+        batch_size = supabase_batch_size([to_record(row) for row in sample])
+        row_count = 0
+        for chunk in iter_batches(chain(sample, rows), batch_size):
+            batch = [to_record(row) for row in chunk]
+            row_count += len(batch)
             try:
                 supabase.table(table).upsert(batch).execute()
             except Exception as e:
                 print(f"  Error inserting into {table}: {e}")
                 continue
 
-        print(f"  {table}: {len(data)} rows imported")
+        print(f"  {table}: {row_count} rows imported")
 
     conn.close()
     print("\nDirect import complete!")
 
 
+def migrate_to_postgres_copy(sqlite_path: str, dsn: str, batch_size: int = 50000):
+    """Bulk-load data straight into PostgreSQL with COPY (much faster than upserts)."""
+    if not HAS_PSYCOPG2:
+        print("Error: psycopg2 is not installed. Run: pip install psycopg2-binary")
+        sys.exit(1)
+
+    print(f"Reading from: {sqlite_path}")
+    print("Importing via COPY to PostgreSQL")
+
+    conn = open_sqlite_source(sqlite_path)
+    pg = psycopg2.connect(dsn)
+    migrated_tables = []
+
+    try:
+        with pg.cursor() as cur:
+            for table in MIGRATION_ORDER:
+                columns, rows = get_sqlite_data(conn, table, batch_size)
+
+                if rows is None:
+                    print(f"  {table}: (empty or not found)")
+                    continue
+
+                pg_columns = map_columns(table, columns)
+                create, copy, insert = copy_staging_sql(table, ", ".join(pg_columns))
+
+                cur.execute(create)
+                row_count = 0
+                for batch in prefetch_batches(rows, batch_size):
+                    row_count += len(batch)
+                    cur.copy_expert(copy, _rows_to_copy_text(batch))
+                cur.execute(insert)
+                migrated_tables.append(table)
+                print(f"  {table}: {row_count} rows copied")
+
+            cur.execute(reset_sequences_sql(migrated_tables))
+            cur.execute("SELECT refresh_all_analytics_views()")
+        pg.commit()
+    except Exception:
+        pg.rollback()
+        raise
+    finally:
+        pg.close()
+        conn.close()
+
+    print("\nCOPY import complete!")
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+
+
 def main():
     parser = argparse.ArgumentParser(description="Migrate SQLite data to PostgreSQL")
     parser.add_argument(
         "--sqlite-path",
-        default=os.path.join(os.path.dirname(__file__), "..", "data.db"),
+        type=Path,
+        default=MIGRATIONS_DIR.parent / "data.db",
         help="Path to SQLite database"
     )
     parser.add_argument(
         "--output",
-        default=os.path.join(os.path.dirname(__file__), "002_seed_data.sql"),
+        type=Path,
+        default=MIGRATIONS_DIR / "002_seed_data.sql",
         help="Output SQL file path"
     )
     parser.add_argument(
@@ -389,21 +794,38 @@ def main():
         "--supabase-key",
         help="Supabase service role key (for direct import)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for the SQL file export (default: one per table, up to CPU count)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(SQL_GENERATORS),
+        default="insert",
+        help="SQL file row format: INSERT statements, or COPY blocks for psql (default: insert)"
+    )
+    parser.add_argument(
+        "--postgres-dsn",
+        help="PostgreSQL connection string (for direct import via COPY)"
+    )
 
     args = parser.parse_args()
 
     # Resolve paths
-    sqlite_path = os.path.abspath(args.sqlite_path)
+    sqlite_path = os.fspath(args.sqlite_path.resolve())
 
     if not os.path.exists(sqlite_path):
         print(f"Error: SQLite database not found at {sqlite_path}")
         sys.exit(1)
 
-    if args.supabase_url and args.supabase_key:
+    if args.postgres_dsn:
+        migrate_to_postgres_copy(sqlite_path, args.postgres_dsn)
+    elif args.supabase_url and args.supabase_key:
         migrate_to_supabase(sqlite_path, args.supabase_url, args.supabase_key)
     else:
-        output_path = os.path.abspath(args.output)
-        migrate_to_sql_file(sqlite_path, output_path)
+        output_path = os.fspath(args.output.resolve())
+        migrate_to_sql_file(sqlite_path, output_path, args.workers, args.format)
 
 
 if __name__ == "__main__":